@@ -1,12 +1,20 @@
 import tkinter as tk
 from tkinter import ttk
-from PIL import Image, ImageTk
-import pandas
-import multiprocessing
+from ImageCache import resized_photo
+import queue
+import threading
+import time
+import Controller as controller_module
+import TutorialPlayer as tutorial_module
 from Controller import Controller
+from LazyImport import warm_up_in_background
 from Model import Model
 from View import View
 
+STARTUP_POLL_MS = 20  # Milliseconds between checks of the start up worker
+WARM_UP_IMPORTS = True  # Import the media libraries in the background once the main window is interactive
+START_VISUALIZER = True  # Start the visualizer process once the main window is interactive
+
 
 class Splash(tk.Toplevel):
 
@@ -27,9 +35,7 @@ class Splash(tk.Toplevel):
         self.progress = 0
 
         # Set the background image for the splash screen
-        self.splash_image = Image.open("images/Splash Screen.jpg")
-        self.resized = self.splash_image.resize((splash_width - 100, splash_height - 100))
-        self.splash_photo = ImageTk.PhotoImage(self.resized)
+        self.splash_photo = resized_photo("images/Splash Screen.jpg", (splash_width - 100, splash_height - 100))
         self.splash_label = ttk.Label(self, image=self.splash_photo)
         self.splash_label.pack()
 
@@ -42,13 +48,14 @@ class Splash(tk.Toplevel):
         self.progress_label = ttk.Label(self, text="0%")
         self.progress_label.pack()
 
-    # Define the function to update the progress bar
-    def update_progress(self):
-        if self.progress <= 101:
-            self.my_progress["value"] = self.progress
+    # Define the function to update the progress bar with the progress reported by the start up loader
+    def update_progress(self, progress, message=None):
+        self.progress = progress
+        self.my_progress["value"] = self.progress
+        if message is None:
             self.progress_label.config(text=f"{self.progress}%")
-            self.progress += 2
-            self.after(1)
+        else:
+            self.progress_label.config(text=f"{self.progress}% {message}")
 
     def destroy_splash_screen(self):
         self.destroy()
@@ -58,7 +65,15 @@ class App(tk.Tk):
     def __init__(self):
         tk.Tk.__init__(self)
 
+        # start time of the application, used to measure the time to the first interactive frame
+        self.start_time = time.perf_counter()
+
         self.splash = None
+        self.model = None
+        self.view = None
+        self.startup_error = None
+        self.startup_thread = None
+        self.startup_queue = queue.Queue()
         self.start_up_app()
 
         self.title("SandGlass application")
@@ -70,80 +85,78 @@ class App(tk.Tk):
     def start_up_app(self):
         self.show_splash_screen()
 
-        # load db in separate process
-        process_startup = multiprocessing.Process(target=App.startup_process(self))
-        process_startup.start()
+        # load the catalog on a worker thread so the splash screen keeps drawing, widgets are built on this thread
+        # once the worker has finished
+        self.startup_thread = threading.Thread(target=self.startup_process, name="startup", daemon=True)
+        self.startup_thread.start()
+        self.after(STARTUP_POLL_MS, self.poll_startup)
+
+    # function to show the progress reported by the start up worker, and build the interface when it has finished
+    def poll_startup(self):
+        while True:
+            try:
+                progress, message = self.startup_queue.get_nowait()
+            except queue.Empty:
+                break
+            self.splash.update_progress(progress, message)
+
+        if self.startup_thread.is_alive():
+            self.after(STARTUP_POLL_MS, self.poll_startup)
+            return
+
+        if self.startup_error is not None:
+            print(f"Start up failed: {self.startup_error}")
+            self.destroy()
+            return
 
-        while process_startup.is_alive():
-            self.splash.update()
-            self.splash.update_progress()
+        self.splash.update_progress(90, "Building interface")
+        self.splash.update_idletasks()
+        self.build_view(self.model)
 
-        self.splash.my_progress["value"] = 100
-        self.splash.progress_label.config(text="100")
-        self.after(1000)
+        self.splash.update_progress(100)
+        self.splash.update_idletasks()
         self.remove_splash_screen()
+        self.after_idle(self.report_startup_time)
+        if WARM_UP_IMPORTS:
+            self.after_idle(warm_up_in_background,
+                            [controller_module.pygame, tutorial_module.cv2, tutorial_module.ffpyplayer_player])
+        if START_VISUALIZER:
+            self.after_idle(self.view.visualizer.start)
+
+    # function to print the time from launch until the main window is drawn and waiting for input
+    def report_startup_time(self):
+        print(f"Time to first interactive frame: {time.perf_counter() - self.start_time:.3f} seconds")
 
     def show_splash_screen(self):
         self.withdraw()
         self.splash = Splash(self)
 
-    # function to initialize application on its own thread to prevent application data corruption
-    @staticmethod
+    # function to load the catalog on the start up worker thread, progress is sent to the splash screen through the
+    # start up queue. Tk must not be touched from this thread.
     def startup_process(self):
+        try:
+            self.model = self.load_model(self.report_progress)
+        except Exception as e:
+            self.startup_error = e
 
-        # Function called if the CSV requires reformatting
-        def cleanup_csv(nasa_data_frame):
-            nasa_data_frame = pandas.read_csv(csvName)
-            # Check the first 25 rows and columns for instances of the old column names or comments
-            n_rows, n_cols = nasa_data_frame.shape
-            for i in range(min(n_rows, 25)):
-                for j in range(min(n_cols, 25)):
-                    if nasa_data_frame.iloc[i, j] == 'pl_name':
-                        nasa_data_frame.iloc[i, j] = 'name'
-                    elif nasa_data_frame.iloc[i, j] == 'pl_bmasse' or nasa_data_frame.iloc[i, j] == 'pl_masse':
-                        nasa_data_frame.iloc[i, j] = 'mass'
-                    elif nasa_data_frame.iloc[i, j] == 'sy_dist':
-                        nasa_data_frame.iloc[i, j] = 'distance'
-                    elif '#' in str(nasa_data_frame.iloc[i, j]):
-                        nasa_data_frame = nasa_data_frame.drop(i)
-                    elif nasa_data_frame.columns[j] == 'name' and nasa_data_frame.iloc[i, j] == 'name':
-                        nasa_data_frame = nasa_data_frame.drop(i)
-
-            nasa_data_frame.to_csv(csvName, index=False)  # Write the changes into the CSV
-            nasa_data_frame.reset_index(drop=True, inplace=True)
-            return nasa_data_frame  # Function end
-
-        # read all data from CSV
+    def report_progress(self, progress, message=None):
+        self.startup_queue.put((progress, message))
+
+    @staticmethod
+    def load_model(report_progress):
         # csvName = "testing/Dev_Test_Set.csv"  # un-comment for development testing
         csvName = "NASA_PRODUCTION.csv"  # un-comment for production
-        nasa_data_frame = pandas.read_csv(csvName)
 
-        # check if the name column is already in the correct location
-        if 'name' in nasa_data_frame.columns:
-            nasa_data_frame = pandas.read_csv(csvName)
-        else:
-            # Check if the first row contains "#", if it does, call cleanup function to remove it as comments remain from download
-            if nasa_data_frame.iloc[0].str.contains("#").any():
-                nasa_data_frame = cleanup_csv(nasa_data_frame)
-
-        # The File can have header issues, especially when downloaded so accounting for column headers out of place is required
-        header_row = None
-        for i in range(len(nasa_data_frame)):  # parsing without modification has minimal effeciency impact
-            row = nasa_data_frame.loc[i]
-            if 'name' in row.values and 'mass' in row.values and 'distance' in row.values:
-                header_row = i
-                break
-
-        # if the header row was found, set it as the column names and delete all previous rows
-        if header_row is not None:
-            nasa_data_frame.columns = nasa_data_frame.loc[header_row]
-
-        # convert dataframe to data dictionary to be passed to model constructor
-        planet_data = nasa_data_frame.to_dict('records')
-        model = Model(planet_data)
+        # the model reads the cached archive catalog, or streams the CSV straight into typed columns
+        # its stages fill the splash screen progress from 10% to 80%, building the interface takes the rest
+        report_progress(10, "Loading planet catalog")
+        return Model(csvName, progress=lambda fraction, message: report_progress(10 + int(fraction * 70), message))
 
+    # function to build the interface around the loaded model, runs on the Tk thread
+    def build_view(self, model):
         # initialize the parent ttk frame which will have our 3 frame layout attached
         view = View(self)
+        self.view = view
 
         # draw the view onto the Parent window to take up the full space
         view.grid(row=0, column=0, sticky="nsew")
@@ -157,6 +170,14 @@ class App(tk.Tk):
         # model
         view.draw_widgets()
 
+    # function to stop the visualizer process along with the application
+    def destroy(self):
+        if self.view is not None:
+            self.view.controller.calculations.shutdown()
+            self.view.controller.model.results.close()
+            self.view.visualizer.close()
+        super().destroy()
+
     def remove_splash_screen(self):
         self.splash.destroy_splash_screen()
         del self.splash
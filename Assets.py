@@ -0,0 +1,77 @@
+import math
+from LazyImport import LazyModule
+
+pygame = LazyModule("pygame")
+
+# images used by the About screen and the visualizer
+BACKGROUND_IMAGE = "images/visualization_background.jpg"
+EARTH_IMAGE = "images/earth.png"
+PLANET_IMAGES = tuple(f"images/planets/planet ({p_index}).png" for p_index in range(1, 7))
+ABOUT_FRAMES = tuple(f"images/frames/frame ({i + 1}).gif" for i in range(61))
+
+# images decoded from disk, kept for the life of the process
+DECODED = {}
+# surfaces built from the decoded images (scaled, converted for the display, atlases and pre-rendered pages),
+# keyed by what they were built from so each window size keeps its own copy
+PREPARED = {}
+
+
+# function to decode an image file the first time it is used, every later call returns the same surface
+def load(path):
+    if path not in DECODED:
+        DECODED[path] = pygame.image.load(path)
+    return DECODED[path]
+
+
+# function to get a surface from the cache or build it once with the given function
+def prepared(key, build):
+    if key not in PREPARED:
+        PREPARED[key] = build()
+    return PREPARED[key]
+
+
+# function to get an image scaled to size (None keeps its own size) and converted to the display pixel format so
+# blitting it is fast. A display mode must be set before calling this.
+def image(path, size=None, alpha=False):
+    def build():
+        surface = load(path)
+        if size is not None and surface.get_size() != tuple(size):
+            surface = pygame.transform.scale(surface, size)
+        return surface.convert_alpha() if alpha else surface.convert()
+
+    return prepared(('image', path, size, alpha), build)
+
+
+# function to pack the frames of an animation into a single surface, laid out in a grid so neither side gets too large
+# for the display. Returns the atlas and the area of every frame in it, a frame is drawn with
+# screen.blit(atlas, position, rects[frame]). The decoded frames are not kept once they are in the atlas, so each
+# frame is held in memory only once.
+def atlas(paths, alpha=False):
+    def build():
+        frames = [DECODED.pop(path, None) or pygame.image.load(path) for path in paths]
+        frame_width = max(frame.get_width() for frame in frames)
+        frame_height = max(frame.get_height() for frame in frames)
+        columns = math.ceil(math.sqrt(len(frames)))
+        rows = math.ceil(len(frames) / columns)
+        sheet = pygame.Surface((columns * frame_width, rows * frame_height), pygame.SRCALPHA if alpha else 0)
+
+        rects = []
+        for index, frame in enumerate(frames):
+            row, column = divmod(index, columns)
+            rects.append(sheet.blit(frame, (column * frame_width, row * frame_height)))
+        return (sheet.convert_alpha() if alpha else sheet.convert()), rects
+
+    return prepared(('atlas', tuple(paths), alpha), build)
+
+
+# function to decode a list of images ahead of time, so the first time a screen is opened does not wait on the disk
+# either. Returns the paths that could be loaded, missing files are skipped.
+def preload(paths):
+    loaded = []
+    for path in paths:
+        try:
+            load(path)
+        except (FileNotFoundError, pygame.error):
+            continue
+        loaded.append(path)
+    return loaded
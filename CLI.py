@@ -0,0 +1,205 @@
+import argparse
+import contextlib
+import csv
+import json
+import sys
+import numpy
+import Expansion
+from Controller import Controller, NAME_FILTER_LENGTH, RANGE_NOT_POSITIVE, RANGE_REVERSED
+from Model import Model
+from ResultCache import RESULT_CACHE_PATH
+
+OUTPUT_FORMATS = ('csv', 'jsonl')
+
+
+# function to add the planet filter options shared by the command line tools, they take the same values as the
+# filter boxes of the application
+def add_filter_arguments(parser):
+    parser.add_argument('--name', help="only planets whose name contains this text")
+    parser.add_argument('--distance', help="only planets in this distance range in parsecs, e.g. 50 or 10-50")
+    parser.add_argument('--mass', help="only planets in this mass range in earth masses, e.g. 5 or 1-5")
+
+
+# function to check a filter range option with the same rules as the filter boxes of the application, returns the
+# (minimum, maximum) range. Raises ValueError with a message for the user if the range cannot be applied.
+def parse_filter_range(option, value):
+    try:
+        minimum, maximum = Controller.parse_range(value)
+    except ValueError:
+        raise ValueError(f"{option} must be a number or a range such as 10-50, not {value!r}")
+    problem = Controller.range_problem(minimum, maximum)
+    if problem == RANGE_NOT_POSITIVE:
+        raise ValueError(f"{option} values must be greater than zero")
+    if problem == RANGE_REVERSED:
+        raise ValueError(f"{option} range minimum must be less than the maximum")
+    return minimum, maximum
+
+
+# function to check an efficiency index option against the range of the application's slider, a step size or sample
+# count outside it never finishes or cannot be calculated. Raises ValueError with a message for the user.
+def check_efficiency_index(efficiency_index):
+    if efficiency_index not in Expansion.EFFICIENCY_INDICES:
+        raise ValueError(f"efficiency index {efficiency_index} must be from {Expansion.EFFICIENCY_INDICES[0]} to "
+                         f"{Expansion.EFFICIENCY_INDICES[-1]}")
+
+
+# function to tell if any filter option was given
+def has_filters(args):
+    return any(value is not None for value in (args.name, args.distance, args.mass))
+
+
+# function to apply the filter options to the model, returns the catalog row indices of the matching planets
+# raises ValueError with a message for the user if a filter value is rejected by the application's rules
+def filter_planets(model, args):
+    if args.name is not None:
+        name = args.name.strip()
+        if not name:
+            raise ValueError("--name cannot be empty")
+        if len(name) > NAME_FILTER_LENGTH:
+            raise ValueError(f"--name cannot exceed {NAME_FILTER_LENGTH} characters")
+        model.filters.set_name(name)
+    if args.distance is not None:
+        model.filters.set_distance(*parse_filter_range('--distance', args.distance))
+    if args.mass is not None:
+        model.filters.set_mass(*parse_filter_range('--mass', args.mass))
+    model.apply_filters()
+    return model.filtered_indices
+
+
+# function to load the model without the application window. Messages about loading the catalog go to stderr so
+# stdout only holds results, and the catalog is never refreshed from the archive so the command does not wait on it.
+def load_model(result_cache_path):
+    with contextlib.redirect_stdout(sys.stderr):
+        return Model(result_cache_path=result_cache_path, refresh=False)
+
+
+# function to turn the result of a calculation into an output row of plain python values
+def result_row(calculation, result):
+    planet = calculation.planet
+    row = {
+        'name': planet.name,
+        'distance': float(planet.distance),
+        'mass': None if planet.mass != planet.mass else float(planet.mass),  # NaN where the catalog has no mass
+        'engine': result['engine'],
+        'efficiency_index': calculation.efficiency_index,
+        'time': float(result['time']),
+        'starting_velocity': float(result['starting_velocity']),
+        'num_calc': int(result['num_calc']),
+        'step': None if result['step'] is None else float(result['step']),
+        'error': float(result['error']),
+        'calc': float(result['calc']),
+    }
+    # the monte carlo engine also gives the percentile bands of the time and starting velocity
+    if 'percentiles' in result:
+        for name in ('time', 'velocity'):
+            for percentile, value in zip(result['percentiles'], result[name + '_bands']):
+                row[name + '_p' + '{:g}'.format(percentile)] = float(value)
+    return row
+
+
+# generator of the output rows of the analytic engine for the given catalog row indices. The closed form is
+# calculated for every planet in one batch, which is faster than looking each one up in the result cache, so the
+# cache is not used. The rows match the ones result_row gives for the analytic engine, the batch time is shared
+# between the planets.
+def batch_rows(model, indices):
+    result = model.run_batch(indices=indices)
+    calc = result['calc'] / max(len(indices), 1)
+    columns = zip(result['name'], model.catalog.distance[indices].tolist(), model.catalog.mass[indices].tolist(),
+                  result['time'].tolist(), result['starting_velocity'].tolist())
+    for name, distance, mass, t, starting_velocity in columns:
+        yield {
+            'name': name,
+            'distance': distance,
+            'mass': None if mass != mass else mass,  # NaN where the catalog has no mass
+            'engine': Expansion.ENGINE_ANALYTIC,
+            'efficiency_index': model.efficiency_index,
+            'time': t,
+            'starting_velocity': starting_velocity,
+            'num_calc': 1,
+            'step': None,
+            'error': 0.0,
+            'calc': calc,
+        }
+
+
+# Class writing result rows to a stream as CSV with a header taken from the first row, or as one JSON object a line
+class ResultWriter:
+    def __init__(self, stream, output_format):
+        self.stream = stream
+        self.output_format = output_format
+        self.writer = None
+
+    def write(self, row):
+        if self.output_format == 'jsonl':
+            self.stream.write(json.dumps(row) + '\n')
+        else:
+            if self.writer is None:
+                self.writer = csv.DictWriter(self.stream, fieldnames=list(row), extrasaction='ignore')
+                self.writer.writeheader()
+            self.writer.writerow(row)
+        self.stream.flush()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Calculate how long until planets leave the observable universe, "
+                                                 "without the application window")
+    parser.add_argument('planets', nargs='*', help="planet names, every planet matching the filters if none are given")
+    add_filter_arguments(parser)
+    parser.add_argument('--engine', default=Expansion.ENGINE_ITERATIVE, choices=Expansion.ENGINES,
+                        help="calculation engine, the iterative engine takes about 4 minutes for the whole catalog at "
+                             "efficiency index 1 and hours at 100, the analytic engine calculates it in one batch")
+    parser.add_argument('--efficiency', type=int, default=1, help="efficiency index from 1 to 100")
+    parser.add_argument('--hubble', type=float, default=Expansion.HUBBLE_CONSTANT,
+                        help="hubble constant in km/s/Mpc")
+    parser.add_argument('--max-distance', type=float, default=Expansion.MAX_DISTANCE,
+                        help="distance to the observable universe edge in KM")
+    parser.add_argument('--format', default='csv', choices=OUTPUT_FORMATS)
+    parser.add_argument('--no-cache', action='store_true', help="do not read or write the result cache on disk")
+    args = parser.parse_args(argv)
+    if args.planets and has_filters(args):
+        parser.error('planet names cannot be combined with --name, --distance or --mass')
+    try:
+        check_efficiency_index(args.efficiency)
+    except ValueError as e:
+        parser.error(str(e))
+
+    model = load_model(None if args.no_cache else RESULT_CACHE_PATH)
+    model.engine = args.engine
+    model.efficiency_index = args.efficiency
+    model.tolerance = Expansion.tolerance_from_index(args.efficiency)
+    model.hubble_constant = args.hubble
+    model.max_distance = args.max_distance
+
+    status = 0
+    if args.planets:
+        planets = []
+        for name, planet in zip(args.planets, model.get_planets(args.planets)):
+            if planet is None:
+                print('No planet named ' + name, file=sys.stderr)
+                status = 1
+            else:
+                planets.append(planet)
+        indices = numpy.array([planet.index for planet in planets], dtype=numpy.int64)
+    else:
+        try:
+            indices = filter_planets(model, args)
+        except ValueError as e:
+            parser.error(str(e))
+        planets = [model.planets[index] for index in indices.tolist()]
+
+    writer = ResultWriter(sys.stdout, args.format)
+    try:
+        if args.engine == Expansion.ENGINE_ANALYTIC:
+            for row in batch_rows(model, indices):
+                writer.write(row)
+        else:
+            for planet in planets:
+                calculation = model.new_calculation(planet)
+                writer.write(result_row(calculation, model.calculate(calculation)))
+    finally:
+        model.results.close()
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,84 @@
+import concurrent.futures
+import threading
+import Expansion
+
+CALCULATION_WORKERS = 1  # Calculations run one at a time in the order they were requested
+CALCULATION_POLL_MS = 50  # Milliseconds between checks of the running calculation from the Tk event loop
+
+
+# Class holding one requested calculation: the planet, the engine settings at the time it was requested, and the
+# progress and cancellation shared between the worker thread running it and the Tk thread watching it
+class Calculation:
+    def __init__(self, planet, engine, efficiency_index, tolerance, trajectory_samples=0,
+                 hubble_constant=Expansion.HUBBLE_CONSTANT, max_distance=Expansion.MAX_DISTANCE):
+        self.planet = planet
+        self.engine = engine
+        self.efficiency_index = efficiency_index
+        self.tolerance = tolerance
+        self.trajectory_samples = trajectory_samples
+        self.hubble_constant = hubble_constant
+        self.max_distance = max_distance
+        self.progress = 0.0  # fraction of the calculation done, written by the worker
+        self.cancelled = threading.Event()
+        self.future = None
+
+    # function to get the key the result of this calculation is cached under. Settings the engine does not use are
+    # left out, so e.g. the analytic answer is shared by every efficiency index.
+    def key(self):
+        if self.engine == Expansion.ENGINE_ITERATIVE:
+            settings = (self.efficiency_index, self.trajectory_samples)
+        elif self.engine == Expansion.ENGINE_MONTE_CARLO:
+            settings = (self.efficiency_index,)
+        elif self.engine == Expansion.ENGINE_ADAPTIVE:
+            settings = (self.tolerance,)
+        else:
+            settings = ()
+        return (self.planet.name, float(self.planet.distance), self.engine) + settings + \
+            (self.hubble_constant, self.max_distance)
+
+    # function passed to the engine to report the fraction done
+    def report_progress(self, fraction):
+        self.progress = fraction
+
+    def cancel(self):
+        self.cancelled.set()
+        if self.future is not None:
+            self.future.cancel()  # a calculation that has not started yet is dropped from the queue
+
+
+# Class that runs calculations on a worker thread so the Tk event loop keeps running. Calculations queue up behind
+# the running one, and are handed back in the order they were requested once they finish.
+class CalculationQueue:
+    def __init__(self, workers=CALCULATION_WORKERS):
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers,
+                                                              thread_name_prefix="calculation")
+        self.calculations = []
+
+    # function to queue function(calculation) on the worker
+    def submit(self, function, calculation):
+        calculation.future = self.executor.submit(function, calculation)
+        self.calculations.append(calculation)
+        return calculation
+
+    def __len__(self):
+        return len(self.calculations)
+
+    # function to get the calculation that is running, or the next one to run, None if the queue is empty
+    def current(self):
+        return self.calculations[0] if self.calculations else None
+
+    # function to remove and return the calculations at the front of the queue that have finished or were cancelled
+    def finished(self):
+        done = []
+        while self.calculations and self.calculations[0].future.done():
+            done.append(self.calculations.pop(0))
+        return done
+
+    # function to cancel the running calculation and every queued one
+    def cancel_all(self):
+        for calculation in self.calculations:
+            calculation.cancel()
+
+    def shutdown(self):
+        self.cancel_all()
+        self.executor.shutdown(wait=False)
@@ -0,0 +1,403 @@
+import csv
+import hashlib
+import json
+import math
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+import numpy
+from LazyImport import LazyModule
+from Planet import Planet
+
+# requests is only needed by the background refresh, so it is kept off the start up path
+requests = LazyModule("requests")
+
+# URL for the TAP API endpoint
+CATALOG_URL = "https://exoplanetarchive.ipac.caltech.edu/TAP/sync"
+
+# Construct the query to select all planets that have a known mass and distance
+CATALOG_QUERY = "SELECT pl_name, pl_bmasse, sy_dist FROM pscomppars WHERE sy_dist IS NOT NULL AND pl_bmasse IS NOT " \
+                "NULL ORDER BY pl_name"
+
+SEED_PATH = "NASA_PRODUCTION.csv"  # Catalog shipped with the application, used when there is no cached copy
+CACHE_PATH = "cache/catalog.json"  # Local copy of the last catalog downloaded from the archive
+SNAPSHOT_PATH = "cache/catalog.bin"  # Binary copy of the catalog columns, memory mapped at start up
+CACHE_TTL = 24 * 60 * 60  # Seconds before the local copy is refreshed from the archive
+REQUEST_TIMEOUT = 30  # Seconds before a catalog download is abandoned
+CSV_PROGRESS_LINES = 500  # Lines of a catalog CSV read between progress reports
+CATALOG_ROW_KEYS = {'name', 'mass', 'distance'}  # Keys of every planet row in the cached copy
+
+
+# Class that keeps a copy of the NASA Exoplanet Archive catalog on disk so the application can start without waiting
+# on the network. The copy is refreshed in the background once it is older than the TTL, and only replaced when the
+# archive returns different data.
+class CatalogCache:
+    def __init__(self, path=CACHE_PATH, ttl=CACHE_TTL, url=CATALOG_URL, timeout=REQUEST_TIMEOUT):
+        self.path = path
+        self.ttl = ttl
+        self.url = url
+        self.timeout = timeout
+        self.entry = None
+
+    # function to read the cached catalog from disk, returns the planet rows or None if there is no usable cache
+    # a copy that is not a catalog written by save, e.g. a hand edited or truncated file, is treated as no cache
+    def load(self):
+        try:
+            with open(self.path, encoding="utf-8") as cache_file:
+                entry = json.load(cache_file)
+            rows = entry['rows']
+            if not all(isinstance(data, dict) and CATALOG_ROW_KEYS <= data.keys() for data in rows):
+                raise ValueError("catalog rows without a name, mass and distance")
+        except (OSError, ValueError, KeyError, TypeError):
+            self.entry = None
+            return None
+        self.entry = entry
+        return rows
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    # function to check if the cached copy is older than the TTL. The file time is the time the copy was last
+    # downloaded or found unchanged on the archive, see touch.
+    def is_stale(self):
+        try:
+            return time.time() - os.path.getmtime(self.path) > self.ttl
+        except OSError:
+            return True
+
+    # function to download the catalog and write it to disk if it has changed
+    # returns the new planet rows, or None if the archive data is the same as the cached copy
+    def refresh(self):
+        # the start up path may have used the catalog snapshot, the cached copy is needed for its validators
+        if self.entry is None:
+            self.load()
+
+        params = {
+            "REQUEST": "doQuery",
+            "LANG": "ADQL",
+            "FORMAT": "json",
+            "QUERY": CATALOG_QUERY
+        }
+
+        # ask the server to skip the download if nothing changed since the cached copy was fetched
+        headers = {}
+        if self.entry is not None:
+            if self.entry.get('etag'):
+                headers['If-None-Match'] = self.entry['etag']
+            if self.entry.get('last_modified'):
+                headers['If-Modified-Since'] = self.entry['last_modified']
+
+        response = requests.get(self.url, params=params, headers=headers, timeout=self.timeout)
+        if response.status_code == 304:
+            self.touch()
+            return None
+        response.raise_for_status()
+
+        # the archive does not always send validators, so compare the content as well
+        digest = hashlib.sha256(response.content).hexdigest()
+        if self.entry is not None and self.entry.get('hash') == digest:
+            self.touch()
+            return None
+
+        rows = [{'name': data['pl_name'], 'mass': data['pl_bmasse'], 'distance': data['sy_dist']}
+                for data in json.loads(response.text)]
+        self.entry = {
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'hash': digest,
+            'rows': rows,
+        }
+        self.save()
+        return rows
+
+    # function to refresh the catalog on a daemon thread, on_update is called on that thread with the new rows only if
+    # they changed
+    def refresh_in_background(self, on_update):
+        def worker():
+            try:
+                rows = self.refresh()
+            except (requests.exceptions.RequestException, OSError, ValueError, KeyError, TypeError) as e:
+                print(f"Catalog refresh failed: {e}", file=sys.stderr)
+                return
+            if rows is not None:
+                on_update(rows)
+
+        thread = threading.Thread(target=worker, name="catalog-refresh", daemon=True)
+        thread.start()
+        return thread
+
+    # function to restart the TTL of the cached copy. Only the file time changes, the content is left as it is so the
+    # catalog snapshot derived from it stays valid.
+    def touch(self):
+        os.utime(self.path)
+
+    # function to write the cache through a temporary file so a crash never leaves a half written catalog
+    def save(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as cache_file:
+            json.dump(self.entry, cache_file)
+        os.replace(temp_path, self.path)
+
+
+# NASA Exoplanet Archive column names and the catalog column each one is read into
+COLUMN_ALIASES = {
+    'name': 'name', 'pl_name': 'name',
+    'mass': 'mass', 'pl_bmasse': 'mass', 'pl_masse': 'mass',
+    'distance': 'distance', 'sy_dist': 'distance',
+}
+
+
+# function to read a catalog CSV in a single pass, straight into typed columns. Files downloaded from the archive
+# start with '#' comment lines and use the archive column names, so comments are skipped, the header row is the first
+# row that names all three columns, and any repeated header rows are dropped.
+# progress is called with the fraction of the file read every CSV_PROGRESS_LINES lines, if given.
+def read_catalog_csv(path=SEED_PATH, progress=None):
+    names = []
+    mass = []
+    distance = []
+    positions = None
+
+    size = max(os.path.getsize(path), 1) if progress is not None else 1
+    with open(path, newline='', encoding='utf-8') as csv_file:
+        for row in csv.reader(catalog_lines(csv_file, progress, size)):
+            if positions is None:
+                columns = {}
+                for position, heading in enumerate(row):
+                    column = COLUMN_ALIASES.get(heading.strip())
+                    if column is not None:
+                        columns.setdefault(column, position)
+                if len(columns) == 3:
+                    positions = (columns['name'], columns['mass'], columns['distance'])
+                    width = max(positions)
+                    header = row[positions[0]]
+                continue
+
+            if len(row) <= width or row[positions[0]] == header:
+                continue
+            names.append(sys.intern(row[positions[0]]))
+            mass.append(to_float(row[positions[1]]))
+            distance.append(to_float(row[positions[2]]))
+
+    return PlanetCatalog(names, numpy.array(mass, dtype=numpy.float64), numpy.array(distance, dtype=numpy.float64))
+
+
+# generator of the lines of a catalog CSV without the '#' comment lines, reporting the fraction of the size read to
+# progress as it goes. The characters read are counted, which is the size in bytes for the ASCII catalog files.
+def catalog_lines(csv_file, progress=None, size=1):
+    read = 0
+    for count, line in enumerate(csv_file, 1):
+        read += len(line)
+        if progress is not None and count % CSV_PROGRESS_LINES == 0:
+            progress(min(read / size, 1.0))
+        if not line.startswith('#'):
+            yield line
+
+
+# function to convert a catalog value to float, missing values from the CSV or archive become NaN
+def to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+# Class that stores the planet catalog as columns, names are interned strings and mass and distance are float64
+# arrays so filters and batch calculations work on contiguous memory without converting each row
+class PlanetCatalog:
+    def __init__(self, names, mass, distance):
+        self.names = names
+        self.mass = mass
+        self.distance = distance
+        # one view per row, shared by every list of planets handed to the interface
+        self.planets = [Planet(self, index) for index in range(len(names))]
+
+        # name to row lookup, the first row wins if the archive lists a name twice
+        self.name_index = {}
+        for index, name in enumerate(names):
+            self.name_index.setdefault(name, index)
+
+        # sorted indexes built once at load, each is the row order by value and the sorted values
+        # rows without a value are left out so they never match a range
+        self.sorted_indexes = {}
+        for column, values in (('mass', mass), ('distance', distance)):
+            order = numpy.argsort(values, kind='stable')[:numpy.count_nonzero(~numpy.isnan(values))]
+            self.sorted_indexes[column] = (order, values[order])
+
+        # trigram index over the lowercased names, built by the first name search so it stays off the start up path
+        self.lower_names = None
+        self.trigrams = None
+        self.last_search = None
+
+    # function to build the catalog from planet rows with name, mass and distance keys
+    @classmethod
+    def from_rows(cls, rows):
+        names = []
+        mass = []
+        distance = []
+        for data in rows:
+            names.append(sys.intern(str(data['name'])))
+            mass.append(to_float(data['mass']))
+            distance.append(to_float(data['distance']))
+        return cls(names, numpy.array(mass, dtype=numpy.float64), numpy.array(distance, dtype=numpy.float64))
+
+    def __len__(self):
+        return len(self.names)
+
+    # function to get the row indices, in catalog order, whose column value is at least minimum and less than maximum
+    # the bounds are found by binary search so only the matching slice is touched
+    def range_indices(self, column, minimum=None, maximum=None):
+        order, values = self.sorted_indexes[column]
+        start = 0 if minimum is None else numpy.searchsorted(values, minimum, 'left')
+        stop = len(values) if maximum is None else numpy.searchsorted(values, maximum, 'left')
+        return numpy.sort(order[start:max(start, stop)])
+
+    # function to build the trigram index, each trigram maps to the sorted rows whose lowercased name contains it
+    def build_name_index(self):
+        lower_names = [name.lower() for name in self.names]
+        postings = {}
+        for index, name in enumerate(lower_names):
+            for trigram in {name[i:i + 3] for i in range(len(name) - 2)}:
+                postings.setdefault(trigram, []).append(index)
+        self.trigrams = {trigram: numpy.array(rows, dtype=numpy.int64) for trigram, rows in postings.items()}
+        self.lower_names = lower_names
+
+    # function to get the row indices, in catalog order, of the planets whose lowercased name contains the query
+    # the posting lists of the query trigrams are intersected and the few candidates left are checked directly
+    def search_names(self, query):
+        if self.trigrams is None:
+            self.build_name_index()
+
+        query = query.lower()
+        if self.last_search is not None and self.last_search[0] == query:
+            return self.last_search[1]
+
+        if self.last_search is not None and self.last_search[0] in query:
+            # typing more characters can only narrow the previous results
+            candidates = self.last_search[1]
+        elif len(query) < 3:
+            candidates = None
+        else:
+            trigrams = {query[i:i + 3] for i in range(len(query) - 2)}
+            if any(trigram not in self.trigrams for trigram in trigrams):
+                # a trigram no planet name contains means no name can contain the query
+                candidates = numpy.zeros(0, dtype=numpy.int64)
+            else:
+                trigrams = sorted(trigrams, key=lambda trigram: len(self.trigrams.get(trigram)))
+                candidates = self.trigrams.get(trigrams[0])
+                for trigram in trigrams[1:]:
+                    candidates = intersect_sorted(candidates, self.trigrams.get(trigram))
+
+        lower_names = self.lower_names
+        if candidates is None:
+            rows = [index for index, name in enumerate(lower_names) if query in name]
+        else:
+            rows = [index for index in candidates.tolist() if query in lower_names[index]]
+
+        indices = numpy.array(rows, dtype=numpy.int64)
+        self.last_search = (query, indices)
+        return indices
+
+    # function to get the planet view with the given name, or None if the catalog has no such planet
+    def get(self, name):
+        index = self.name_index.get(name)
+        if index is None:
+            return None
+        return self.planets[index]
+
+    # function to get the planet views for an array of row indices
+    def select(self, indices):
+        planets = self.planets
+        return [planets[index] for index in indices.tolist()]
+
+
+# function to intersect two sorted arrays of row indices, each row of the shorter array is binary searched in the
+# longer one so the cost follows the smaller result set instead of the catalog size
+def intersect_sorted(left, right):
+    if len(left) > len(right):
+        left, right = right, left
+    if len(left) == 0:
+        return left
+    positions = numpy.searchsorted(right, left)
+    positions[positions == len(right)] = 0
+    return left[right[positions] == left]
+
+
+# Binary snapshot layout: a header with the format, the number of planets and a signature of the file the catalog was
+# read from, then the mass and distance columns as little endian float64, the character offsets of each name, and
+# the names as one UTF-8 blob
+SNAPSHOT_MAGIC = b"SGCATLG1"
+SNAPSHOT_HEADER = struct.Struct("<8sQ32s")
+
+
+# function to get a signature of the content of a catalog source file, the snapshot is re-derived whenever the content
+# changes. The file time is not part of it because a refresh that finds the same data only touches the file.
+def source_signature(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as source_file:
+        for block in iter(lambda: source_file.read(1 << 20), b""):
+            digest.update(block)
+    return digest.digest()
+
+
+# function to write the catalog columns to a snapshot file, a failed write only means the next start up is slower
+def write_snapshot(catalog, source, path=SNAPSHOT_PATH):
+    names = "".join(catalog.names)
+    offsets = numpy.zeros(len(catalog) + 1, dtype="<i8")
+    numpy.cumsum([len(name) for name in catalog.names], out=offsets[1:])
+
+    try:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = path + ".tmp"
+        with open(temp_path, "wb") as snapshot_file:
+            snapshot_file.write(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, len(catalog), source_signature(source)))
+            snapshot_file.write(numpy.ascontiguousarray(catalog.mass, dtype="<f8").tobytes())
+            snapshot_file.write(numpy.ascontiguousarray(catalog.distance, dtype="<f8").tobytes())
+            snapshot_file.write(offsets.tobytes())
+            snapshot_file.write(names.encode("utf-8"))
+        os.replace(temp_path, path)
+    except OSError as e:
+        print(f"Unable to write catalog snapshot: {e}")
+
+
+# function to memory map a snapshot file written from the given source
+# returns None if there is no snapshot, it was written from a different version of the source, or it is truncated or
+# corrupt, in which case the catalog is parsed again and the snapshot rewritten
+def load_snapshot(source, path=SNAPSHOT_PATH):
+    try:
+        with open(path, "rb") as snapshot_file:
+            snapshot = mmap.mmap(snapshot_file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, count, signature = SNAPSHOT_HEADER.unpack_from(snapshot)
+        if magic != SNAPSHOT_MAGIC or signature != source_signature(source):
+            return None
+
+        # the header, both columns and the name offsets must fit in the file before they are mapped
+        position = SNAPSHOT_HEADER.size
+        if len(snapshot) < position + count * 8 * 2 + (count + 1) * 8:
+            return None
+
+        # the columns are read only views onto the mapped file, nothing is copied
+        mass = numpy.frombuffer(snapshot, dtype="<f8", count=count, offset=position)
+        position += count * 8
+        distance = numpy.frombuffer(snapshot, dtype="<f8", count=count, offset=position)
+        position += count * 8
+        offsets = numpy.frombuffer(snapshot, dtype="<i8", count=count + 1, offset=position).tolist()
+        position += (count + 1) * 8
+
+        # the offsets count characters of the names, they must run in order from the start to the end of the text
+        text = snapshot[position:].decode("utf-8")
+        if offsets[0] != 0 or offsets[-1] != len(text) or any(
+                start > end for start, end in zip(offsets, offsets[1:])):
+            return None
+    except (OSError, ValueError, struct.error):
+        return None
+
+    names = [sys.intern(text[offsets[index]:offsets[index + 1]]) for index in range(count)]
+    return PlanetCatalog(names, mass, distance)
@@ -1,26 +1,136 @@
 import re
-import pygame as pygame
+import Assets
+import Expansion
+from Calculations import CalculationQueue, CALCULATION_POLL_MS
+from LazyImport import LazyModule
+
+CATALOG_POLL_MS = 500  # Milliseconds between checks for a refreshed catalog
+
+# pygame is only needed by the about window, it is imported when the window is first opened
+pygame = LazyModule("pygame")
+
+# A filter range such as "10-50", either side may be left out, numbers may use exponents such as "1e-3"
+NUMBER = r'(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?'
+RANGE_PATTERN = re.compile(r'^\s*(' + NUMBER + r')?\s*-\s*(' + NUMBER + r')?\s*$')
+# Problems with a filter range found by Controller.range_problem
+RANGE_NOT_POSITIVE = "not positive"
+RANGE_REVERSED = "reversed"
+NAME_FILTER_LENGTH = 30  # Longest name filter accepted
 
 
 class Controller:
     def __init__(self, model, view):
         self.model = model
         self.view = view
+        self.calculations = CalculationQueue()
+
+        # a refreshed catalog is swapped in from the Tk event loop once the background refresh has built it
+        if self.model.is_refreshing():
+            self.view.after(CATALOG_POLL_MS, self.poll_catalog_updates)
 
     def get_planets(self):
         return self.model.filteredPlanets
 
+    # function run from the Tk event loop while the catalog is being refreshed, it swaps in the new catalog and
+    # updates the planet selection list
+    def poll_catalog_updates(self):
+        if self.model.apply_catalog_updates():
+            self.view.selection_dropdown.configure(values=self.model.filteredPlanets)
+            self.write_console('Planet catalog updated from the NASA Exoplanet Archive: ' +
+                               str(len(self.model.catalog)) + ' planets\n')
+        if self.model.is_refreshing():
+            self.view.after(CATALOG_POLL_MS, self.poll_catalog_updates)
+
+    # function that queues a calculation of the selected planet on the worker thread, so the window keeps responding
+    # while it runs. Calculations requested while one is running wait their turn.
     def start_algorithm(self):
         selected_planet = self.get_selected_planet()
-        self.model.run_algorithm(self, selected_planet)
+        if selected_planet is None:
+            return
+
+        calculation = self.model.new_calculation(selected_planet)
+        self.calculations.submit(self.model.calculate, calculation)
+        if len(self.calculations) > 1:
+            self.write_console(str(selected_planet) + ': calculation queued, ' + str(len(self.calculations) - 1) +
+                               ' ahead of it\n')
+        else:
+            self.view.after(CALCULATION_POLL_MS, self.poll_calculations)
+
+    # function run from the Tk event loop while calculations are queued, it shows the progress of the running
+    # calculation and hands finished results to the console and the visualizer
+    def poll_calculations(self):
+        for calculation in self.calculations.finished():
+            self.finish_calculation(calculation)
+
+        current = self.calculations.current()
+        self.view.calculation_progress.configure(value=current.progress * 100 if current is not None else 0)
+        if current is not None:
+            self.view.after(CALCULATION_POLL_MS, self.poll_calculations)
+
+    # function to report a finished calculation, cancelled ones and errors are reported in the console
+    def finish_calculation(self, calculation):
+        if calculation.future.cancelled():
+            self.write_console(str(calculation.planet) + ': queued calculation cancelled\n')
+            return
+        try:
+            result = calculation.future.result()
+        except Expansion.CalculationCancelled:
+            self.write_console(str(calculation.planet) + ': calculation cancelled\n')
+            return
+        except Exception as e:
+            self.write_console('EXCEPTION: An Error was encountered calculating ' + str(calculation.planet) + ': ' +
+                               str(e) + '\n')
+            return
+
+        self.model.show_result(self, calculation, result)
+
+        # the monte carlo engine also reports the spread of the time and starting velocity
+        if result['engine'] == Expansion.ENGINE_MONTE_CARLO:
+            self.write_console(str(calculation.planet) + ': ' + self.describe_bands(result) + '\n')
+
+        if result['cached']:
+            self.write_console(str(calculation.planet) + ': ' + result['engine'] + ' engine result loaded from the '
+                               'result cache, relative error against the analytic answer ' +
+                               '{:.3g}'.format(result['error']) + '\n')
+            return
+
+        # report the accuracy and latency of the calculation so the efficiency index can be compared
+        self.write_console(str(calculation.planet) + ': ' + result['engine'] + ' engine finished in ' +
+                           str(round(result['calc'], 4)) + ' seconds, ' + str(result['num_calc']) +
+                           ' calculations, relative error against the analytic answer ' +
+                           '{:.3g}'.format(result['error']) + '\n')
+
+    # function to describe the percentile bands of a monte carlo result in console messages
+    @staticmethod
+    def describe_bands(result):
+        bands = []
+        for name, values, unit in (('time', result['time_bands'], ' years'),
+                                   ('starting velocity', result['velocity_bands'], ' km/s')):
+            bands.append(name + ' ' + ', '.join('p' + '{:g}'.format(percentile) + ' ' + '{:.5g}'.format(value) + unit
+                                                for percentile, value in zip(result['percentiles'], values)))
+        return '; '.join(bands)
+
+    # function to cancel the running calculation and every queued one
+    def cancel_algorithm(self):
+        if len(self.calculations) == 0:
+            self.write_console('No calculation is running\n')
+            return
+        self.calculations.cancel_all()
+
+    # function to add a line of text to the console
+    def write_console(self, text):
+        self.view.console_text_output.configure(state='normal')
+        self.view.console_text_output.insert('end', text)
+        self.view.console_text_output.configure(state='disabled')
 
     # function to restore the planet selection list to the original DataSet included at initialization.
     def clear_filters(self):
 
         # reset the filter planet list to the original state
-        self.model.filteredPlanets = self.model.planets
+        self.model.reset_filters()
         # reset the efficiency index of the application
         self.model.efficiency_index = 1
+        self.model.tolerance = Expansion.tolerance_from_index(1)
         # reset the efficiency slider to default position
         self.view.efficiency_slider.set(1)
 
@@ -64,64 +174,131 @@ class Controller:
             return
 
         else:
-            for planet in self.model.planets:
-                if planet.name == selected_planet:
-                    selected_planet = planet
-                    return selected_planet
+            return self.model.get_planet(selected_planet)
 
     def get_efficiency_index(self):
         return self.model.efficiency_index
 
+    def get_engine(self):
+        return self.model.engine
+
+    def get_engines(self):
+        return Expansion.ENGINES
+
     # function to set the efficiency index of the model for calculations and output a client message to console
     def submit_efficiency(self):
         efficiency_value = self.view.efficiency_slider.get()
 
         self.model.efficiency_index = efficiency_value
+        # the adaptive engine takes a relative tolerance in place of the efficiency index
+        self.model.tolerance = Expansion.tolerance_from_index(efficiency_value)
 
         # reset the output window text, include welcome message and filter message
         self.view.console_text_output.configure(state='normal')
-        self.view.console_text_output.insert('end',
-                                             'Efficiency index of calculation set to ' + str(efficiency_value) +
-                                             '% factor of calculation increments\n')
+        if self.model.engine == Expansion.ENGINE_ADAPTIVE:
+            self.view.console_text_output.insert('end',
+                                                 'Efficiency index of calculation set to ' + str(efficiency_value) +
+                                                 ', relative tolerance of ' + '{:.3g}'.format(self.model.tolerance) +
+                                                 '\n')
+        elif self.model.engine == Expansion.ENGINE_MONTE_CARLO:
+            self.view.console_text_output.insert('end',
+                                                 'Efficiency index of calculation set to ' + str(efficiency_value) +
+                                                 ', ' + str(Expansion.samples_from_index(efficiency_value)) +
+                                                 ' samples of distance and hubble constant\n')
+        else:
+            self.view.console_text_output.insert('end',
+                                                 'Efficiency index of calculation set to ' + str(efficiency_value) +
+                                                 '% factor of calculation increments\n')
+        self.view.console_text_output.configure(state='disabled')
+
+    # function to set the engine used by the model for calculations and output a client message to console
+    def submit_engine(self, event=None):
+        engine = self.view.engine_selection.get()
+        if engine not in Expansion.ENGINES:
+            return
+
+        self.model.engine = engine
+
+        self.view.console_text_output.configure(state='normal')
+        self.view.console_text_output.insert('end', 'Calculation engine set to ' + engine + '\n')
         self.view.console_text_output.configure(state='disabled')
 
+    # function to parse a filter value, either a maximum ("50") or a range ("10-50", "10-" or "-50")
+    # raises ValueError if the value is not a number or range
+    @staticmethod
+    def parse_range(value):
+        match = RANGE_PATTERN.match(value)
+        if match is None:
+            return None, float(value)
+        minimum, maximum = match.groups()
+        if minimum is None and maximum is None:
+            raise ValueError(value)
+        return (None if minimum is None else float(minimum)), (None if maximum is None else float(maximum))
+
+    # function to check a parsed filter range, returns RANGE_NOT_POSITIVE if a bound is not greater than zero,
+    # RANGE_REVERSED if the minimum is not less than the maximum, or None if the range can be applied
+    @staticmethod
+    def range_problem(minimum, maximum):
+        if any(value is not None and value <= 0 for value in (minimum, maximum)):
+            return RANGE_NOT_POSITIVE
+        if minimum is not None and maximum is not None and minimum >= maximum:
+            return RANGE_REVERSED
+        return None
+
+    # function to describe a filter range in console messages
+    @staticmethod
+    def describe_range(minimum, maximum):
+        if minimum is None:
+            return 'less than ' + str(maximum)
+        if maximum is None:
+            return 'of at least ' + str(minimum)
+        return 'between ' + str(minimum) + ' and ' + str(maximum)
+
     def filter_by_mass(self):
-        self.inputted_mass = 0
         self.filtered_mass = []
         self.filtered_mass_planet = []
 
         try:
             self.inputted_mass_string = self.view.mass_input.get()
-            self.inputted_mass = float(self.view.mass_input.get())
+            minimum, maximum = self.parse_range(self.inputted_mass_string)
 
-            if self.inputted_mass <= 0:
+            problem = self.range_problem(minimum, maximum)
+            if problem == RANGE_NOT_POSITIVE:
                 self.view.console_text_output.configure(state='normal')
                 self.view.console_text_output.insert('end',
                                                      'ERROR: Mass value must be greater than zero \n')
                 self.view.console_text_output.configure(state='disabled')
                 return
 
+            if problem == RANGE_REVERSED:
+                self.view.console_text_output.configure(state='normal')
+                self.view.console_text_output.insert('end',
+                                                     'ERROR: Mass range minimum must be less than the maximum \n')
+                self.view.console_text_output.configure(state='disabled')
+                return
+
             self.view.console_text_output.configure(state='normal')
             self.view.console_text_output.insert('end', 'SUCCESS: Mass filter applied \n')
             self.view.mass_input.delete(0, 'end')
 
-            for planet in self.model.filteredPlanets:
-                if hasattr(planet, 'mass') and float(planet.mass) < self.inputted_mass:
-                    self.filtered_mass.append(planet)
-                    self.filtered_mass_planet.append(planet.name)
+            # replace the mass filter in the pipeline, the other filters are reused from its cache
+            indices = self.model.filters.run(mass=(minimum, maximum))
+            self.filtered_mass = self.model.catalog.select(indices)
+            self.filtered_mass_planet = [planet.name for planet in self.filtered_mass]
 
             if len(self.filtered_mass) == 0:
-                self.view.console_text_output.insert('end', 'No results found with mass less than ' + str(
-                    self.inputted_mass) + '\n')
+                self.view.console_text_output.insert('end', 'No results found with mass ' + self.describe_range(
+                    minimum, maximum) + '\n')
                 self.view.console_text_output.configure(state='disabled')
                 self.view.name_input.delete(0, 'end')
                 self.view.selection_dropdown.configure(values=self.filtered_mass_planet)
                 self.view.planet_selection.set("No results found")
                 return
 
-            self.model.filteredPlanets = self.filtered_mass
+            self.model.filters.set_mass(minimum, maximum)
+            self.model.apply_filters()
             self.view.console_text_output.insert('end', str(len(
-                self.filtered_mass)) + ' results found with mass less than ' + str(self.inputted_mass) + '\n')
+                self.filtered_mass)) + ' results found with mass ' + self.describe_range(minimum, maximum) + '\n')
             self.view.console_text_output.configure(state='disabled')
             self.view.name_input.delete(0, 'end')
             self.view.selection_dropdown.configure(values=self.filtered_mass_planet)
@@ -144,37 +321,46 @@ class Controller:
 
         try:
             self.inputted_distance_string = self.view.range_input.get()
-            self.inputted_distance = float(self.view.range_input.get())
+            minimum, maximum = self.parse_range(self.inputted_distance_string)
 
-            if self.inputted_distance <= 0:
+            problem = self.range_problem(minimum, maximum)
+            if problem == RANGE_NOT_POSITIVE:
                 self.view.console_text_output.configure(state='normal')
                 self.view.console_text_output.insert('end',
                                                      'ERROR: Range value must be greater than zero\n')
                 self.view.console_text_output.configure(state='disabled')
                 return
 
+            if problem == RANGE_REVERSED:
+                self.view.console_text_output.configure(state='normal')
+                self.view.console_text_output.insert('end',
+                                                     'ERROR: Range minimum must be less than the maximum\n')
+                self.view.console_text_output.configure(state='disabled')
+                return
+
             self.view.console_text_output.configure(state='normal')
             self.view.console_text_output.insert('end', 'SUCCESS: Range filter applied\n')
             self.view.range_input.delete(0, 'end')
 
-            for planet in self.model.filteredPlanets:
-                if hasattr(planet, 'distance') and float(planet.distance) < self.inputted_distance:
-                    self.filtered_distance_string.append(planet)
-                    self.filtered_distance.append(planet.name)
+            # replace the distance filter in the pipeline, the other filters are reused from its cache
+            indices = self.model.filters.run(distance=(minimum, maximum))
+            self.filtered_distance_string = self.model.catalog.select(indices)
+            self.filtered_distance = [planet.name for planet in self.filtered_distance_string]
 
             if len(self.filtered_distance_string) == 0:
-                self.view.console_text_output.insert('end', 'No results found with distance less than ' + str(
-                    self.inputted_distance) + ' Parsecs from Earth.\n')
+                self.view.console_text_output.insert('end', 'No results found with distance ' + self.describe_range(
+                    minimum, maximum) + ' Parsecs from Earth.\n')
                 self.view.console_text_output.configure(state='disabled')
                 self.view.name_input.delete(0, 'end')
                 self.view.selection_dropdown.configure(values=self.filtered_distance)
                 self.view.planet_selection.set("No results found")
                 return
 
-            self.model.filteredPlanets = self.filtered_distance_string
+            self.model.filters.set_distance(minimum, maximum)
+            self.model.apply_filters()
             self.view.console_text_output.insert('end', str(len(
-                self.filtered_distance_string)) + ' results found with distance less than ' + str(
-                self.inputted_distance) + ' Parsecs from Earth.\n')
+                self.filtered_distance_string)) + ' results found with distance ' + self.describe_range(
+                minimum, maximum) + ' Parsecs from Earth.\n')
             self.view.console_text_output.configure(state='disabled')
             self.view.name_input.delete(0, 'end')
             self.view.selection_dropdown.configure(values=self.filtered_distance)
@@ -205,7 +391,7 @@ class Controller:
             return
 
         # Input cannot exceed 30 characters
-        if len(searchName) > 30:
+        if len(searchName) > NAME_FILTER_LENGTH:
             self.view.console_text_output.configure(state='normal')
             self.view.console_text_output.insert('end', 'Error: Name filter value cannot exceed 30 characters \n')
             self.view.console_text_output.configure(state='disabled')
@@ -215,11 +401,9 @@ class Controller:
 
         # Check the dataset for the specified string
         else:
-            tempPlanets = []
-
-            for planet in self.model.filteredPlanets:
-                if hasattr(planet, 'name') and searchName in planet.name.lower():
-                    tempPlanets.append(planet)
+            # replace the name filter in the pipeline, the other filters are reused from its cache
+            indices = self.model.filters.run(name=searchName)
+            tempPlanets = self.model.catalog.select(indices)
 
             if len(tempPlanets) == 0:
                 self.view.console_text_output.configure(state='normal')
@@ -233,7 +417,8 @@ class Controller:
                 self.view.planet_selection.set("No results found")
                 return
             else:
-                self.model.filteredPlanets = tempPlanets
+                self.model.filters.set_name(searchName)
+                self.model.apply_filters()
                 self.view.console_text_output.configure(state='normal')
                 if len(tempPlanets) == 1:
                     self.view.console_text_output.insert('end', 'SUCCESS: Name filter applied \n ' + str(
@@ -250,6 +435,72 @@ class Controller:
                 # Set the drop-down list to the filtered list
                 self.view.selection_dropdown.configure(values=tempPlanets)
 
+    # function to narrow the drop down list to the filtered planets matching the name typed so far
+    # the name filter itself is only applied when the user submits
+    def suggest_names(self, event=None):
+        searchName = self.view.name_input.get().strip().lower()
+        if searchName == "" or len(searchName) > 30:
+            self.view.selection_dropdown.configure(values=self.model.filteredPlanets)
+            return
+
+        # preview the typed name in place of the current name filter
+        indices = self.model.filters.run(name=searchName)
+        self.view.selection_dropdown.configure(values=self.model.catalog.select(indices))
+
+    # Function that renders everything on the about page that does not move: the background and the text above and
+    # below the gif image. Returns the page and the position of the gif image on it.
+    @staticmethod
+    def render_about_page(width, height):
+        page = Assets.image(Assets.BACKGROUND_IMAGE, (width, height)).copy()
+
+        # Define the text to display
+        header_font = pygame.font.SysFont("Times New Roman", 60)
+        sub_header_font = pygame.font.SysFont("Times New Roman", 35)
+        font = pygame.font.SysFont("Times New Roman", 25)
+
+        # define the text to be placed above the gif image
+        header_text = "Welcome to SandGlass!"
+        sub_header_text = "SandGlass has been created for the NASA SpaceApps 2023 Competition!"
+        text1 = "\n\nSandGlass is an interactive application for interfacing with the NASA Exoplanet archives " \
+                "database in order to determine the point when an\nindividual planet will leave the currently " \
+                "viewable universe. Sandglass allows you to filter and select from all known Exoplanets " \
+                "classified\nby NASA based on the planet's title, current distance from Earth in parsecs (pc), and "\
+                "planetary mass in relation to Earth.\n\nUsing the current Hubble constant, a planet's distance from "\
+                "earth, and the maximum distance viewable by the hubble telescope, Sandglass\nis able to determine "\
+                "how many years it will take for a planet to reach the edge of the viewable universe, and therefore disappear "\
+                "from the night\nsky, based on universal expansion theory."
+
+        # define the text to be placed below the gif image
+        text2 = "Filter your selection from over 5000 classified exo-planets while using the efficiency index to " \
+                "adjust the accuracy and speed of your calculation.\nOnce your selection has been made, Sandglass " \
+                "will perform a series of calculations using the Hubble constant and your planet's initial distance from\n" \
+                "Earth to determine the exponential velocity of that planet's expansion away from Earth's galaxy " \
+                "and to predict the number of years the planet will be\nviewable by the Hubble telescope. " \
+                "Sandglass will then present the data to you with our galactic visualizer."
+
+        # function that draws text one line at a time from y_position (since pygame can't process newlines) and
+        # returns the y position after the last line
+        def draw_lines(text_to_split, y_position):
+            for sentence in text_to_split.split('\n'):
+                page.blit(font.render(sentence, True, (255, 255, 255)), (75, y_position))
+                y_position += 25  # Increment the y position for blit so each surface prints on a new line
+            return y_position
+
+        # draw header texts
+        y_position = 20
+        page.blit(header_font.render(header_text, True, (255, 255, 255)), (500, y_position))
+        y_position += 75
+
+        # draw sub header texts
+        page.blit(sub_header_font.render(sub_header_text, True, (255, 255, 255)), (250, y_position))
+        y_position += 25
+
+        # print the first block of text, leave room for the gif image, then print the second block
+        y_position = draw_lines(text1, y_position) + 30
+        frame_position = (350, y_position)
+        draw_lines(text2, y_position + 500)
+        return page, frame_position
+
     # Function that creates a window with the "about" information of the application
     def about_app(self, w, h):
 
@@ -265,98 +516,29 @@ class Controller:
             pygame.display.set_caption("About the Sandglass Application")
             clock = pygame.time.Clock()
 
-            # Load the background image and scale it to match the screen size
-            background_image = pygame.image.load("images/visualization_background.jpg").convert()
-            background_picture = pygame.transform.scale(background_image, (WIDTH, HEIGHT))
-
-            # Function that will send text to the next line when it finds a \n (since pygame can't process them)
-            def process_newlines(text_to_split):
-                # Create a list where every element is a line of text up to a newline character. Deletes the newline character
-                split_text = text_to_split.split('\n')
-
-                # Create a list of surfaces, where each surface in the list is one line of text
-                surfaces = []
-                for sentence in split_text:
-                    new_surface = font.render(sentence, True, (255, 255, 255))
-                    surfaces.append(new_surface)
-                return surfaces
-
-            # load each frame of the gif image into array
-            frames = []
-            for i in range(61):
-                frames.append(pygame.image.load(f"images/frames/frame ({i + 1}).gif").convert_alpha())
-
-            # Define the text to display
-            header_font = pygame.font.SysFont("Times New Roman", 60)
-            sub_header_font = pygame.font.SysFont("Times New Roman", 35)
-            font = pygame.font.SysFont("Times New Roman", 25)
-
-            # define the text to be placed above the gif image
-            header_text = "Welcome to SandGlass!"
-            sub_header_text = "SandGlass has been created for the NASA SpaceApps 2023 Competition!"
-            text1 = "\n\nSandGlass is an interactive application for interfacing with the NASA Exoplanet archives " \
-                    "database in order to determine the point when an\nindividual planet will leave the currently " \
-                    "viewable universe. Sandglass allows you to filter and select from all known Exoplanets " \
-                    "classified\nby NASA based on the planet's title, current distance from Earth in parsecs (pc), and "\
-                    "planetary mass in relation to Earth.\n\nUsing the current Hubble constant, a planet's distance from "\
-                    "earth, and the maximum distance viewable by the hubble telescope, Sandglass\nis able to determine "\
-                    "how many years it will take for a planet to reach the edge of the viewable universe, and therefore disappear "\
-                    "from the night\nsky, based on universal expansion theory."
-
-            # define the text to be placed below the gif image
-            text2 = "Filter your selection from over 5000 classified exo-planets while using the efficiency index to " \
-                    "adjust the accuracy and speed of your calculation.\nOnce your selection has been made, Sandglass " \
-                    "will perform a series of calculations using the Hubble constant and your planet's initial distance from\n" \
-                    "Earth to determine the exponential velocity of that planet's expansion away from Earth's galaxy " \
-                    "and to predict the number of years the planet will be\nviewable by the Hubble telescope. " \
-                    "Sandglass will then present the data to you with our galactic visualizer."
-
-
-            # Create the arrays that will store the lines that fit into the window
-            formatted_text1 = process_newlines(text1)
-            formatted_text2 = process_newlines(text2)
-
-            # Pygame loop
+            # the frames of the gif image packed into one surface, decoded the first time About is opened
+            frames, frame_rects = Assets.atlas(Assets.ABOUT_FRAMES)
+            page, frame_position = Assets.prepared(('about', WIDTH, HEIGHT),
+                                                  lambda: self.render_about_page(WIDTH, HEIGHT))
+
+            # Pygame loop, the page does not change so only the area of the gif image is drawn after the first frame
+            screen.blit(page, (0, 0))
+            pygame.display.flip()
             running = True
             current_frame = 0
             while running:
-
-                # draw the background
-                screen.blit(background_picture, (0, 0))
-
-                y_position = 20
                 for event in pygame.event.get():
                     if event.type == pygame.QUIT:
                         running = False
 
-                # draw header texts
-                header_surface = header_font.render(header_text, True, (255, 255, 255))
-                screen.blit(header_surface, (500, y_position))
-                y_position += 75
-
-                # draw sub header texts
-                sub_header_surface = sub_header_font.render(sub_header_text, True, (255, 255, 255))
-                screen.blit(sub_header_surface, (250, y_position))
-                y_position += 25
-
-                # print the first block of text
-                for surface in formatted_text1:
-                    screen.blit(surface, (75, y_position))
-                    y_position += 25  # Increment the y position for blit so each surface prints on a new line
-
                 # display each frame of the gif as an animated image
-                y_position += 30
-                screen.blit(frames[current_frame], (350, y_position))
+                frame_area = pygame.Rect(frame_position, frame_rects[current_frame].size)
+                screen.blit(page, frame_area, frame_area)
+                screen.blit(frames, frame_position, frame_rects[current_frame])
+                pygame.display.update(frame_area)
                 current_frame += 1  # go to the next frame
-                current_frame %= len(frames)
-
-                y_position += 500
+                current_frame %= len(frame_rects)
 
-                # Print the second block of text
-                for surface in formatted_text2:
-                    screen.blit(surface, (75, y_position))
-                    y_position += 25  # Increment the y position for blit so each surface prints on a new line
-                pygame.display.flip()
                 clock.tick(8)  # set the frame rate for smooth animation of the gif image
 
             pygame.quit()
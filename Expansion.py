@@ -0,0 +1,281 @@
+import math
+import time
+import numpy
+
+HUBBLE_CONSTANT = 69.8  # Current value for hubble constant in km/s/Mpc
+MAX_DISTANCE = 439999652819071048e+23  # Distance to Observable Universe Edge in KM
+PC_TO_KM = 3.0857 * 10 ** 13  # Kilometres in one parsec
+KM_TO_MPC = 3.2407792896664E-20  # Megaparsecs in one kilometre
+
+# engine modes that can be selected to calculate the expansion time of a planet
+ENGINE_ITERATIVE = "iterative"
+ENGINE_ANALYTIC = "analytic"
+ENGINE_ADAPTIVE = "adaptive"
+ENGINE_MONTE_CARLO = "monte carlo"
+ENGINES = (ENGINE_ITERATIVE, ENGINE_ANALYTIC, ENGINE_ADAPTIVE, ENGINE_MONTE_CARLO)
+
+DEFAULT_TOLERANCE = 1e-6  # Relative tolerance used by the adaptive engine
+# Uncertainties drawn by the monte carlo engine, the catalog has no distance errors so a relative one is assumed
+DISTANCE_UNCERTAINTY = 0.05  # Relative standard deviation of the distance to a planet
+HUBBLE_UNCERTAINTY = 1.5  # Standard deviation of the hubble constant in km/s/Mpc, about the spread of its measurements
+MONTE_CARLO_PERCENTILES = (2.5, 16, 50, 84, 97.5)  # Percentiles reported, the median and the 1 and 2 sigma bands
+MONTE_CARLO_CHUNK = 65536  # Samples evaluated at once, bounds the memory used by intermediate arrays
+PROGRESS_INTERVAL = 50000  # Steps of the iterative engine between progress reports and checks for cancellation
+EFFICIENCY_INDICES = range(1, 101)  # Efficiency indices the slider offers, others give no step size or no samples
+
+# Dormand-Prince 5(4) nodes and weights used by the adaptive engine
+DOPRI_NODES = (0, 1 / 5, 3 / 10, 4 / 5, 8 / 9, 1, 1)
+DOPRI_WEIGHTS_5 = (35 / 384, 0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84, 0)
+DOPRI_WEIGHTS_4 = (5179 / 57600, 0, 7571 / 16695, 393 / 640, -92097 / 339200, 187 / 2100, 1 / 40)
+
+
+# function to get the distance in KM the planet has to travel before it leaves the observable universe
+# the distance from earth to the planet is ignored, as in the original algorithm
+def target_distance(distance, max_distance=MAX_DISTANCE):
+    return max_distance - distance * PC_TO_KM
+
+
+# function to get the step size in KM used by the iterative engine for a given efficiency index
+def step_size(distance, efficiency_index, max_distance=MAX_DISTANCE):
+    # Divides by index to lower km for recalculations the larger the index
+    return target_distance(distance, max_distance) / 2000000 / (efficiency_index * 0.1)
+
+
+# function to estimate the number of steps the iterative engine takes, the loop stops on the first step that reaches
+# the target so the count is rounded up. Rounding error building up in the loop's running distance can make it take
+# one step more or less, counting them exactly would mean running the loop. Works on a single distance or an array of
+# distances.
+def step_count(distance, efficiency_index, max_distance=MAX_DISTANCE):
+    distanceKM = distance * PC_TO_KM
+    steps = (target_distance(distance, max_distance) - distanceKM) / step_size(distance, efficiency_index, max_distance)
+    return numpy.maximum(numpy.ceil(steps), 0).astype(numpy.int64)
+
+
+# Exception raised by the iterative engine when the calculation is cancelled before it finishes
+class CalculationCancelled(Exception):
+    pass
+
+
+# function that moves the planet forward in steps of distance, recalculating the velocity after every step.
+# The speed will increase with distance. Time is accumulated in the same unit the application has always displayed.
+# When samples is set, a (samples, 2) array of distance and velocity evenly spaced over the steps is also returned.
+# Every PROGRESS_INTERVAL steps progress is called with the fraction of steps done, and if the cancelled event is set
+# CalculationCancelled is raised.
+def iterative_expansion(distance, efficiency_index, hubble_constant=HUBBLE_CONSTANT, max_distance=MAX_DISTANCE,
+                        samples=0, progress=None, cancelled=None):
+    distanceKM = distance * PC_TO_KM  # Convert distance from PC to KM for loop
+    distanceMPC = distance / 1000000  # Convert distance from PC to MPC for velocity calculations
+
+    numCalc = 0  # This is the number of calculations performed by the algorithm
+
+    velocity = hubble_constant * distanceMPC  # Calculate the starting velocity
+    starting_velocity = velocity  # save initial velocity for display
+
+    # Step size in km for how long the planet will travel before each recalculation
+    step = step_size(distance, efficiency_index, max_distance)
+
+    # Trajectory samples are opt-in, every stride-th step is kept so memory stays bounded at any efficiency index
+    trajectory = None
+    sample = 0
+    next_sample = -1
+    if samples > 0:
+        stride = max(1, -(-int(step_count(distance, efficiency_index, max_distance)) // samples))
+        trajectory = numpy.zeros((samples, 2))
+        next_sample = 0
+
+    # progress and cancellation are checked every PROGRESS_INTERVAL steps, the steps in between only compare a counter
+    next_check = -1
+    if progress is not None or cancelled is not None:
+        total_steps = max(1, int(step_count(distance, efficiency_index, max_distance)))
+        next_check = PROGRESS_INTERVAL
+
+    # get just the distance from the planet to obervational universe edge
+    max_distance = target_distance(distance, max_distance)
+
+    t = 0  # this is to count years for the final result
+    start_time = time.time()  # Start the timer
+
+    while distanceKM < max_distance:
+        distanceKM += step  # Planet moves step KM away from earth
+        delta_t = step / velocity  # Time taken to reach the next increment
+        # recalculate as the distance increases, thus its expansion rate must increase
+        velocity = hubble_constant * (distanceKM * KM_TO_MPC)
+        t += delta_t  # Add the time taken for the current step to the total elapsed time
+
+        if numCalc == next_sample:
+            trajectory[sample] = distanceKM, velocity
+            sample += 1
+            next_sample = numCalc + stride if sample < samples else -1
+        if numCalc == next_check:
+            if cancelled is not None and cancelled.is_set():
+                raise CalculationCancelled()
+            if progress is not None:
+                progress(numCalc / total_steps)
+            next_check += PROGRESS_INTERVAL
+        numCalc += 1
+
+    end_time = time.time()  # Stop the timer
+
+    if trajectory is not None:
+        trajectory = trajectory[:sample]
+
+    return {
+        'time': t,
+        'calc': end_time - start_time,
+        'starting_velocity': starting_velocity,
+        'num_calc': numCalc,
+        'step': step,
+        'trajectory': trajectory,
+    }
+
+
+# function that solves the expansion time in closed form. With a constant hubble parameter the velocity is
+# proportional to distance (v = H * d), so the distance grows exponentially and the time to reach the edge is
+# ln(edge / d) / H, which is the value the iterative engine converges to as the efficiency index grows.
+def analytic_expansion(distance, hubble_constant=HUBBLE_CONSTANT, max_distance=MAX_DISTANCE):
+    start_time = time.time()  # Start the timer
+
+    distanceKM = distance * PC_TO_KM
+    starting_velocity = hubble_constant * (distance / 1000000)
+    t = math.log(target_distance(distance, max_distance) / distanceKM) / (hubble_constant * KM_TO_MPC)
+
+    end_time = time.time()  # Stop the timer
+
+    return {
+        'time': t,
+        'calc': end_time - start_time,
+        'starting_velocity': starting_velocity,
+        'num_calc': 1,
+        'step': None,
+        'trajectory': None,
+    }
+
+
+# function that integrates the time taken to travel each KM (dt/dd = 1 / v) with an adaptive step Dormand-Prince
+# 5(4) integrator. Steps grow while the velocity barely changes and shrink when the embedded error estimate exceeds
+# the relative tolerance, so the requested accuracy of the total time is reached with the fewest evaluations.
+def adaptive_expansion(distance, tolerance=DEFAULT_TOLERANCE, hubble_constant=HUBBLE_CONSTANT,
+                       max_distance=MAX_DISTANCE):
+    start_time = time.time()  # Start the timer
+
+    distanceKM = distance * PC_TO_KM
+    starting_velocity = hubble_constant * (distance / 1000000)
+    max_distance = target_distance(distance, max_distance)
+    rate = hubble_constant * KM_TO_MPC  # velocity gained per KM travelled
+
+    numCalc = 0  # This is the number of steps attempted by the integrator
+    t = 0
+    step = distanceKM * tolerance ** 0.2  # first step is a small fraction of the starting distance
+
+    while distanceKM < max_distance:
+        step = min(step, max_distance - distanceKM)  # do not step past the edge
+        slopes = [1 / (rate * (distanceKM + node * step)) for node in DOPRI_NODES]
+        delta_t = step * sum(w * k for w, k in zip(DOPRI_WEIGHTS_5, slopes))
+        delta_t4 = step * sum(w * k for w, k in zip(DOPRI_WEIGHTS_4, slopes))
+        numCalc += 1
+
+        # normalise the local error by the tolerance share of this step, a value up to 1 means the step is accepted.
+        # Every step keeps its error within the tolerance of its own time, so the errors of all the steps add up to at
+        # most the tolerance of the whole time.
+        error = abs(delta_t - delta_t4) / (tolerance * delta_t)
+        if error <= 1:
+            distanceKM += step
+            t += delta_t
+
+        # grow or shrink the next step based on the error estimate, limited to avoid wild jumps
+        factor = 5 if error == 0 else 0.9 * error ** -0.2
+        step *= min(5, max(0.2, factor))
+
+    end_time = time.time()  # Stop the timer
+
+    return {
+        'time': t,
+        'calc': end_time - start_time,
+        'starting_velocity': starting_velocity,
+        'num_calc': numCalc,
+        'step': None,
+        'trajectory': None,
+    }
+
+
+# function to convert the 1-100 efficiency slider into a relative tolerance for the adaptive engine
+# every 10 points on the slider asks for one more correct digit
+def tolerance_from_index(efficiency_index):
+    return 10 ** (-efficiency_index / 10)
+
+
+# function to get the relative error of a calculated expansion time against the analytic answer
+def relative_error(t, analytic_t):
+    return abs(t - analytic_t) / analytic_t
+
+
+# function that calculates the analytic expansion time, starting velocity and an estimate of the number of steps the
+# iterative engine would take (see step_count) for an array of planet distances in a single NumPy computation
+def batch_expansion(distances, efficiency_index, hubble_constant=HUBBLE_CONSTANT, max_distance=MAX_DISTANCE):
+    start_time = time.time()  # Start the timer
+
+    distances = numpy.asarray(distances, dtype=numpy.float64)
+    distanceKM = distances * PC_TO_KM
+    target = target_distance(distances, max_distance)
+    step = step_size(distances, efficiency_index, max_distance)
+
+    starting_velocity = hubble_constant * (distances / 1000000)
+    t = numpy.log(target / distanceKM) / (hubble_constant * KM_TO_MPC)
+    num_calc = step_count(distances, efficiency_index, max_distance)
+
+    end_time = time.time()  # Stop the timer
+
+    return {
+        'time': t,
+        'calc': end_time - start_time,
+        'starting_velocity': starting_velocity,
+        'num_calc': num_calc,
+        'step': step,
+    }
+
+
+# function to convert the 1-100 efficiency slider into the number of samples drawn by the monte carlo engine
+# every point on the slider adds 10000 samples, so the slider covers 10^4 to 10^6 samples
+def samples_from_index(efficiency_index):
+    return int(efficiency_index) * 10000
+
+
+# function that propagates the uncertainty of the distance to a planet and of the hubble constant to the expansion
+# time. Samples of both are drawn, the distance log-normally so it stays positive, and evaluated in closed form in
+# chunks of MONTE_CARLO_CHUNK samples. Returns the median as the time and starting velocity, and the percentiles of
+# MONTE_CARLO_PERCENTILES of both as time_bands and velocity_bands.
+def monte_carlo_expansion(distance, samples, hubble_constant=HUBBLE_CONSTANT, max_distance=MAX_DISTANCE,
+                          distance_uncertainty=DISTANCE_UNCERTAINTY, hubble_uncertainty=HUBBLE_UNCERTAINTY,
+                          percentiles=MONTE_CARLO_PERCENTILES, chunk_size=MONTE_CARLO_CHUNK, seed=None):
+    start_time = time.time()  # Start the timer
+
+    rng = numpy.random.default_rng(seed)
+    times = numpy.empty(samples)
+    velocities = numpy.empty(samples)
+    for start in range(0, samples, chunk_size):
+        count = min(chunk_size, samples - start)
+        distances = distance * numpy.exp(rng.normal(0, distance_uncertainty, count))
+        hubble_constants = rng.normal(hubble_constant, hubble_uncertainty, count)
+
+        distanceKM = distances * PC_TO_KM
+        velocities[start:start + count] = hubble_constants * (distances / 1000000)
+        times[start:start + count] = numpy.log(target_distance(distances, max_distance) / distanceKM) / \
+            (hubble_constants * KM_TO_MPC)
+
+    # the median is found in the same pass as the percentiles
+    time_median, *time_bands = numpy.percentile(times, (50,) + tuple(percentiles))
+    velocity_median, *velocity_bands = numpy.percentile(velocities, (50,) + tuple(percentiles))
+
+    end_time = time.time()  # Stop the timer
+
+    return {
+        'time': float(time_median),
+        'calc': end_time - start_time,
+        'starting_velocity': float(velocity_median),
+        'num_calc': samples,
+        'step': None,
+        'trajectory': None,
+        'percentiles': tuple(percentiles),
+        'time_bands': numpy.array(time_bands),
+        'velocity_bands': numpy.array(velocity_bands),
+    }
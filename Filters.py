@@ -0,0 +1,95 @@
+from collections import OrderedDict
+import numpy
+from Catalog import intersect_sorted
+
+FILTER_CACHE_SIZE = 64  # Number of filter results kept before the least recently used is dropped
+
+
+# Class that holds the name, distance and mass filters applied to the planet catalog. Each filter's matching rows
+# are cached on their own, so changing one filter value only recomputes that filter and intersects it with the cached
+# results of the others. Combined results are cached as well, so going back to an earlier set of filters is free.
+# The cache is not locked, the pipeline must only be used from the thread that owns the model (the Tk thread in the
+# application, refreshed catalogs are handed to it by Model.apply_catalog_updates).
+class FilterPipeline:
+    STAGES = ('name', 'distance', 'mass')
+
+    def __init__(self, catalog, cache_size=FILTER_CACHE_SIZE):
+        self.catalog = catalog
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        # name is a lowercased substring, distance and mass are (minimum, maximum) ranges, None means not applied
+        self.params = dict.fromkeys(self.STAGES)
+
+    def set_name(self, query):
+        self.params['name'] = query.lower() if query else None
+
+    # functions to set a range filter, minimum is inclusive and maximum is exclusive, None leaves a side open
+    def set_distance(self, minimum=None, maximum=None):
+        self.params['distance'] = self.range_param(minimum, maximum)
+
+    def set_mass(self, minimum=None, maximum=None):
+        self.params['mass'] = self.range_param(minimum, maximum)
+
+    @staticmethod
+    def range_param(minimum, maximum):
+        if minimum is None and maximum is None:
+            return None
+        return minimum, maximum
+
+    def clear(self):
+        self.params = dict.fromkeys(self.STAGES)
+
+    def is_active(self):
+        return any(param is not None for param in self.params.values())
+
+    # function to switch to a refreshed catalog, cached results refer to rows of the old catalog so they are dropped
+    # called from Model.replace_catalog on the thread that runs the filters, never from the refresh thread
+    def set_catalog(self, catalog):
+        self.catalog = catalog
+        self.cache.clear()
+
+    # function to get the sorted row indices matching every applied filter
+    # keyword arguments override a filter for this run only, e.g. to preview a name while the user types
+    def run(self, **overrides):
+        params = dict(self.params)
+        for stage, param in overrides.items():
+            params[stage] = param.lower() if stage == 'name' and param else param
+
+        key = tuple(params[stage] for stage in self.STAGES)
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            return self.cache[key]
+
+        results = [self.stage_result(stage, params[stage]) for stage in self.STAGES if params[stage] is not None]
+        if not results:
+            indices = numpy.arange(len(self.catalog))
+        else:
+            # intersect the smallest results first so every step works on as few rows as possible
+            results.sort(key=len)
+            indices = results[0]
+            for result in results[1:]:
+                indices = intersect_sorted(indices, result)
+
+        self.remember(key, indices)
+        return indices
+
+    # function to get the rows matching a single filter, computed from the catalog indexes on a cache miss
+    def stage_result(self, stage, param):
+        key = (stage, param)
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            return self.cache[key]
+
+        if stage == 'name':
+            indices = self.catalog.search_names(param)
+        else:
+            indices = self.catalog.range_indices(stage, *param)
+
+        self.remember(key, indices)
+        return indices
+
+    # function to store a result and evict the least recently used results past the cache size
+    def remember(self, key, indices):
+        self.cache[key] = indices
+        while len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
@@ -0,0 +1,41 @@
+import hashlib
+import os
+import tkinter
+from LazyImport import LazyModule
+
+# PIL is only needed when an image is not in the cache yet
+Image = LazyModule("PIL.Image")
+ImageTk = LazyModule("PIL.ImageTk")
+
+IMAGE_CACHE_DIRECTORY = "cache/images"
+
+
+# function to get the path of the cached copy of an image resized to size. The name is made from a hash of the source
+# file contents and the size, so an edited image or a different screen size gets a new entry.
+def cache_path(path, size, directory=IMAGE_CACHE_DIRECTORY):
+    with open(path, "rb") as source:
+        digest = hashlib.sha256(source.read()).hexdigest()
+    return os.path.join(directory, f"{digest[:32]}_{size[0]}x{size[1]}.ppm")
+
+
+# function to get a Tk photo of an image resized to size. The resized image is stored uncompressed in the cache, so
+# later launches let Tk read it directly instead of decoding and resampling the full resolution image with PIL.
+# A failed cache write only means the next launch resizes the image again.
+def resized_photo(path, size, directory=IMAGE_CACHE_DIRECTORY):
+    size = (int(size[0]), int(size[1]))
+    cached = cache_path(path, size, directory)
+    if os.path.exists(cached):
+        try:
+            return tkinter.PhotoImage(file=cached)
+        except tkinter.TclError:
+            pass  # unreadable entry, it is written again below
+
+    resized = Image.open(path).convert("RGB").resize(size)
+    try:
+        os.makedirs(directory, exist_ok=True)
+        temp_path = cached + ".tmp"
+        resized.save(temp_path, "PPM")
+        os.replace(temp_path, cached)
+    except OSError as e:
+        print(f"Unable to cache resized image {path}: {e}")
+    return ImageTk.PhotoImage(resized)
@@ -0,0 +1,36 @@
+import importlib
+import threading
+
+
+# Class that stands in for a module and imports it the first time one of its attributes is used, so heavy media
+# libraries are only loaded when the user opens the screen that needs them
+class LazyModule:
+    def __init__(self, name):
+        self.name = name
+        self.module = None
+        self.lock = threading.Lock()
+
+    def load(self):
+        if self.module is None:
+            with self.lock:
+                if self.module is None:
+                    self.module = importlib.import_module(self.name)
+        return self.module
+
+    def __getattr__(self, attribute):
+        return getattr(self.load(), attribute)
+
+
+# function to import lazy modules on a daemon thread, used once the main window is interactive so the first About,
+# Tutorial or visualization does not wait on the import. Modules that are not installed are skipped.
+def warm_up_in_background(modules):
+    def worker():
+        for module in modules:
+            try:
+                module.load()
+            except ImportError as e:
+                print(f"Unable to preload {module.name}: {e}")
+
+    thread = threading.Thread(target=worker, name="import-warm-up", daemon=True)
+    thread.start()
+    return thread
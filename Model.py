@@ -1,122 +1,224 @@
-from Planet import Planet
-import time
-import requests
-import json
+import queue
+import Expansion
+import numpy
+from Catalog import CatalogCache, PlanetCatalog, read_catalog_csv, load_snapshot, write_snapshot, SEED_PATH, \
+    SNAPSHOT_PATH
+from Filters import FilterPipeline
+from Calculations import Calculation
+from ResultCache import ResultCache, RESULT_CACHE_PATH
 
 
 class Model:
 
-    def __init__(self, planet_data):
-        self.planets = []
-
-        # URL for the TAP API endpoint
-        url = "https://exoplanetarchive.ipac.caltech.edu/TAP/sync"
-
-        # Construct the query to select all planets that
-        query = "SELECT pl_name, pl_bmasse, sy_dist FROM pscomppars WHERE sy_dist IS NOT NULL AND pl_bmasse IS NOT NULL ORDER BY pl_name"
-
-        # Parameters for the API call
-        params = {
-            "REQUEST": "doQuery",
-            "LANG": "ADQL",
-            "FORMAT": "json",
-            "QUERY": query
-        }
-        # Make the API call
-        try:
-            response = requests.get(url, params=params)
-
-            if response.status_code == 200:
-                data_list = json.loads(response.text)
-
-                for data in data_list:
-                    planet = Planet(name=data['pl_name'], mass=data['pl_bmasse'], distance=data['sy_dist'])
-                    self.planets.append(planet)
-
+    def __init__(self, seed_path=SEED_PATH, catalog_cache=None, snapshot_path=SNAPSHOT_PATH,
+                 result_cache_path=RESULT_CACHE_PATH, refresh=True, progress=None):
+        # progress is called with the fraction of the start up done and a message for each stage, if given
+        if progress is None:
+            progress = lambda fraction, message: None
+
+        # the catalog is read from the local cache so start up never waits on the NASA Exoplanet Archive
+        self.catalog_cache = catalog_cache if catalog_cache is not None else CatalogCache()
+        self.snapshot_path = snapshot_path
+        source = self.catalog_cache.path if self.catalog_cache.exists() else seed_path
+
+        # the binary snapshot of the source is memory mapped, it is only re-derived when the source has changed
+        progress(0.0, "Loading catalog snapshot")
+        self.catalog = load_snapshot(source, snapshot_path)
+        if self.catalog is not None:
+            print("Planets Loaded from catalog snapshot:", len(self.catalog))
+        else:
+            rows = None
+            if source == self.catalog_cache.path:
+                progress(0.1, "Reading NASA Exoplanet Archive cache")
+                rows = self.catalog_cache.load()
+            if rows is not None:
+                self.catalog = PlanetCatalog.from_rows(rows)
                 # Print the number of planets loaded
-                print("Planets Loaded from NASA Exoplanet Archive:", len(self.planets))
-
+                print("Planets Loaded from NASA Exoplanet Archive cache:", len(self.catalog))
             else:
-                print("Error: Unable to fetch data from the API.")
-                print("Loading Existing Data:")
-                # instantiate planet objects to add to the Model list via the CSV data dictionary on initialization
-                for data in planet_data:
-                    if data['name'] != 'name':
-                        planet = Planet(name=data['name'], mass=data['mass'], distance=data['distance'])
-                        self.planets.append(planet)
+                print("No cached catalog available, Loading Existing Data:")
+                # read the catalog shipped with the application straight into typed columns
+                source = seed_path
+                self.catalog = read_catalog_csv(seed_path, lambda fraction: progress(0.1 + 0.6 * fraction,
+                                                                                     "Reading " + seed_path))
                 # Print the number of planets loaded
-                print("Planets Loaded from NASA_PRODUCTION.csv:", len(self.planets))
-
-        except requests.exceptions.RequestException as e:
-            # Connection error occurred (e.g., no internet connection)
-            print(f"Connection Error: {e}\n Loading Existing Data:")
-            for data in planet_data:
-                if data['name'] != 'name':
-                    planet = Planet(name=data['name'], mass=data['mass'], distance=data['distance'])
-                    self.planets.append(planet)
-            # Print the number of planets loaded
-            print("Planets Loaded from NASA_PRODUCTION.csv:", len(self.planets))
+                print("Planets Loaded from " + seed_path + ":", len(self.catalog))
+            progress(0.7, "Writing catalog snapshot")
+            write_snapshot(self.catalog, source, snapshot_path)
+
+        self.planets = self.catalog.planets
 
         ##
         # create a duplicate list so the original data can be filtered or retrieved without harm
-        self.filteredPlanets = []
+        # the row indices of the filtered planets are kept alongside so filters can work on the catalog columns
         self.filteredPlanets = self.planets
+        self.filtered_indices = numpy.arange(len(self.catalog))
+        self.filters = FilterPipeline(self.catalog)
 
         self.selected_planet = None
         self.efficiency_index = 1
+        self.engine = Expansion.ENGINE_ITERATIVE
+        self.tolerance = Expansion.tolerance_from_index(self.efficiency_index)
+        # number of trajectory samples kept by the iterative engine for plotting, 0 keeps none
+        self.trajectory_samples = 0
+        # constants of the expansion, part of the key results are cached under
+        self.hubble_constant = Expansion.HUBBLE_CONSTANT
+        self.max_distance = Expansion.MAX_DISTANCE
+        # results of earlier calculations, kept on disk between runs
+        progress(0.8, "Opening result cache")
+        self.results = ResultCache(result_cache_path)
+
+        # fetch a newer catalog from the archive in the background. The refresh thread only builds the new catalog,
+        # it is handed over through catalog_updates and swapped in by the thread that owns the model, see
+        # apply_catalog_updates, so the catalog never changes under the filters or the interface.
+        # refresh=False never contacts the archive, for the command line tools that use the catalog on disk as it is.
+        self.catalog_updates = queue.Queue()
+        self.refresh_thread = None
+        if refresh and self.catalog_cache.is_stale():
+            progress(0.9, "Starting catalog refresh")
+            self.refresh_thread = self.catalog_cache.refresh_in_background(self.prepare_catalog)
+        progress(1.0, "Planet catalog loaded")
+
+    # function run on the refresh thread with the rows of a changed catalog, it builds the catalog and its snapshot
+    # without touching the model
+    def prepare_catalog(self, rows):
+        catalog = PlanetCatalog.from_rows(rows)
+        write_snapshot(catalog, self.catalog_cache.path, self.snapshot_path)
+        self.catalog_updates.put(catalog)
+
+    # function to tell if a catalog refresh is still running or waiting to be applied
+    def is_refreshing(self):
+        return (self.refresh_thread is not None and self.refresh_thread.is_alive()) or \
+            not self.catalog_updates.empty()
+
+    # function to swap in a refreshed catalog if one is ready, returns True if the catalog changed
+    # must be called from the thread that uses the model, the Tk thread in the application
+    def apply_catalog_updates(self):
+        catalog = None
+        while True:
+            try:
+                catalog = self.catalog_updates.get_nowait()
+            except queue.Empty:
+                break
+        if catalog is None:
+            return False
+        self.replace_catalog(catalog)
+        return True
+
+    # function to swap in a refreshed catalog, the filters the user has applied are re-run against the new data
+    def replace_catalog(self, catalog):
+        self.results.invalidate(self.changed_planets(self.catalog, catalog))
+        self.catalog = catalog
+        self.planets = catalog.planets
+        self.filters.set_catalog(catalog)
+        self.apply_filters()
+        print("Planets Loaded from NASA Exoplanet Archive:", len(self.catalog))
+
+    # function to get the names of the planets whose distance changed or that were removed between two catalogs
+    @staticmethod
+    def changed_planets(old_catalog, new_catalog):
+        changed = []
+        for index, name in enumerate(old_catalog.names):
+            new_index = new_catalog.name_index.get(name)
+            if new_index is None or new_catalog.distance[new_index] != old_catalog.distance[index]:
+                changed.append(name)
+        return changed
+
+    # function to narrow the filtered planets to the given catalog row indices
+    def set_filtered(self, indices):
+        self.filtered_indices = indices
+        self.filteredPlanets = self.catalog.select(indices)
+
+    # function to update the filtered planets from the filter pipeline
+    def apply_filters(self):
+        if self.filters.is_active():
+            self.set_filtered(self.filters.run())
+        else:
+            self.filtered_indices = numpy.arange(len(self.catalog))
+            self.filteredPlanets = self.planets
+
+    # function to look up a planet by name through the catalog's name index, returns None if it does not exist
+    def get_planet(self, name):
+        return self.catalog.get(name)
+
+    # function to look up several planets by name, names that do not exist are returned as None
+    def get_planets(self, names):
+        return [self.catalog.get(name) for name in names]
+
+    # function to remove every filter and restore the filtered planets to the whole catalog
+    def reset_filters(self):
+        self.filters.clear()
+        self.apply_filters()
 
     # function that takes in the selected planet
-    # calls convert_time_unit in controller to clean up algorithm results
+    # calculates the expansion time with the selected engine and formats the results
     # calls create_visualization in the view with algorithm results to display
     def run_algorithm(self, controller_reference, selected_planet):
-        hubble_constant = 69.8  # Current value for hubble constant
-        max_distance = 439999652819071048e+23  # Distance to Observable Universe Edge in KM
-        distance = selected_planet.distance  # Distance to selected planet in Parsecs
-        # Converted distances to planet being observed#
-        distanceKM = distance * (3.0857 * 10 ** 13)  # Convert distance from PC to KM for loop
-        distanceMPC = distance / 1000000  # Convert distance from PC to MPC for velocity calculations
-
-        numCalc = 0  # This is the number of calculations performed by the algorithm
-
-        velocity = hubble_constant * distanceMPC  # Calculate the starting velocity
-        starting_velocity = velocity  # save initial velocity for display
-
-        max_distance = max_distance - distanceKM  # get just the distance from the planet to obervational universe edge, ignoring distance from earth to the planet
-
-        # Step size in km for how long the planet will travel before each recalculation
-        step = (max_distance / 2000000 / (
-                self.efficiency_index * 0.1))  # Divides by index to lower km for recalculations the larger the index
-
-        t = 0  # this is to count years for the final result
-        start_time = time.time()  # Start the timer
-        data = []  # This is a list to store algorithm results for visualization
-
-        #  loop that increments of distance equal to step, calculates the time that was taken to reach the next increment
-        #  Then recalculate the new velocity and repeat. The speed will increase with distance.
-        while distanceKM < max_distance:
-            distanceKM += step  # Planet moves step KM away from earth
-            delta_t = 0
-            delta_t = step / velocity  # Time taken to reach the next increment
-            # recalculate as the distance increases, thus its expansion rate must increase
-            velocity = hubble_constant * (
-                    distanceKM * 3.2407792896664E-20)  # since distanceKM contains current distance, this is used and converted to mpc as appropriate
-            t += delta_t  # Add the time taken for the current step to the total elapsed time
-
-            #  The data is being stored in a list for later visualization.
-            #  This will also be passed to the view
-            data.append({
-                'distance': distance,
-                'velocity': velocity,
-            })
-            numCalc += 1
-        end_time = time.time()  # Stop the timer
-        t = '{:.5g}'.format(t)  # format scientific notation of time to be limited to 5 digits
+        calculation = self.new_calculation(selected_planet)
+        self.show_result(controller_reference, calculation, self.calculate(calculation))
+
+    # function to capture the current engine settings for a calculation of the selected planet, so a queued
+    # calculation runs with the settings it was requested with
+    def new_calculation(self, selected_planet):
+        return Calculation(selected_planet, self.engine, self.efficiency_index, self.tolerance,
+                           self.trajectory_samples, self.hubble_constant, self.max_distance)
+
+    # function that calculates the expansion time of a calculation and returns the result, it does not touch the view
+    # so it can run on a worker thread. Raises Expansion.CalculationCancelled if the calculation is cancelled.
+    # A calculation that was done before is returned from the result cache, marked with 'cached'.
+    def calculate(self, calculation):
+        key = calculation.key()
+        cached = self.results.get(key)
+        if cached is not None:
+            return dict(cached, cached=True)
+
+        distance = calculation.planet.distance  # Distance to selected planet in Parsecs
+        hubble_constant = calculation.hubble_constant
+        max_distance = calculation.max_distance
+
+        # the analytic answer is O(1), so it is always calculated to measure the error of the iterative engine
+        analytic = Expansion.analytic_expansion(distance, hubble_constant, max_distance)
+        if calculation.engine == Expansion.ENGINE_ANALYTIC:
+            result = analytic
+        elif calculation.engine == Expansion.ENGINE_ADAPTIVE:
+            result = Expansion.adaptive_expansion(distance, calculation.tolerance, hubble_constant, max_distance)
+        elif calculation.engine == Expansion.ENGINE_MONTE_CARLO:
+            result = Expansion.monte_carlo_expansion(distance,
+                                                     Expansion.samples_from_index(calculation.efficiency_index),
+                                                     hubble_constant, max_distance)
+        else:
+            result = Expansion.iterative_expansion(distance, calculation.efficiency_index, hubble_constant, max_distance,
+                                                   samples=calculation.trajectory_samples,
+                                                   progress=calculation.report_progress,
+                                                   cancelled=calculation.cancelled)
+        result['error'] = Expansion.relative_error(result['time'], analytic['time'])
+        result['engine'] = calculation.engine
+        self.results.put(key, result)
+        return dict(result, cached=False)
+
+    # function that formats the result of a calculation and sends it to the view
+    def show_result(self, controller_reference, calculation, result):
+        t = '{:.5g}'.format(result['time'])  # format scientific notation of time to be limited to 5 digits
         t = str(t) + " years"
-        end_time = time.time()  # Stop the timer
-        calc = end_time - start_time
 
-        step = '{:.5g}'.format(step)  # format scientific notation representing step size to be limited to 5 digits
-        step = str(step)
+        if result['step'] is None:
+            step = "N/A"
+        else:
+            step = '{:.5g}'.format(result['step'])  # format scientific notation representing step size to be limited to 5 digits
+            step = str(step)
 
         #  Send formatted value to view
-        controller_reference.view.create_visualization_screen(t, calc, starting_velocity, numCalc, step)
+        controller_reference.view.create_visualization_screen(t, result['calc'], result['starting_velocity'],
+                                                              result['num_calc'], step, calculation.planet,
+                                                              calculation.efficiency_index)
+
+    # function that calculates the expansion of every planet in the catalog, the filtered subset, or the given catalog
+    # row indices at once. Returns the planet names with one array per result column, in the same order as the rows.
+    def run_batch(self, filtered=False, indices=None):
+        if indices is None:
+            indices = self.filtered_indices if filtered else numpy.arange(len(self.catalog))
+
+        result = Expansion.batch_expansion(self.catalog.distance[indices], self.efficiency_index,
+                                           self.hubble_constant, self.max_distance)
+        result['name'] = [self.catalog.names[index] for index in indices.tolist()]
+        return result
@@ -1,8 +1,22 @@
+# Lightweight view of one row in the planet catalog, the values are stored in the catalog's typed columns
 class Planet:
-    def __init__(self, name, mass, distance):
-        self.name = name
-        self.mass = mass
-        self.distance = distance
+    __slots__ = ('catalog', 'index')
+
+    def __init__(self, catalog, index):
+        self.catalog = catalog
+        self.index = index
+
+    @property
+    def name(self):
+        return self.catalog.names[self.index]
+
+    @property
+    def mass(self):
+        return float(self.catalog.mass[self.index])
+
+    @property
+    def distance(self):
+        return float(self.catalog.distance[self.index])
 
     def __str__(self):
         return self.name
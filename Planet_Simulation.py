@@ -2,24 +2,60 @@ import pygame
 import math
 import sys
 import random
+import queue
+import Assets
 
-pygame.init()
+# window and images, created when the first visualization is shown and reused by every visualization after it
+WIN = None
+WIDTH, HEIGHT = 0, 0
+IMAGES = {}
+FONTS = {}
 
-# define the display dimensions dynamically based on system specs.
-screen_info = pygame.display.Info()
-WIDTH, HEIGHT = (screen_info.current_w - 200), (screen_info.current_h - 200)
-WIN = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Planet Simulation")
+IDLE_TIMEOUT_MS = 250  # Longest wait for a window event once the animation has finished
+REDRAW_EVENTS = (pygame.WINDOWEXPOSED, pygame.VIDEOEXPOSE, pygame.VIDEORESIZE)
+EARTH_RADIUS = 30
+ORBITING_RADIUS = 20
 
-# Define the dimensions of each part
-main_part_width = WIDTH - 400  # Width of the main part
-left_part_width = 200  # Width of the left part
-right_part_width = 200  # Width of the right part
 
-# Define the Rect objects for each part
-main_part_rect = pygame.Rect(0, 0, main_part_width, HEIGHT)
-left_part_rect = pygame.Rect(main_part_width, 0, left_part_width, HEIGHT)
-right_part_rect = pygame.Rect(main_part_width + left_part_width, 0, right_part_width, HEIGHT)
+# function to get a font, fonts are looked up and loaded once per size
+def get_font(size):
+    if size not in FONTS:
+        FONTS[size] = pygame.font.SysFont("Times New Roman", size)
+    return FONTS[size]
+
+
+# function to open the visualization window, the display dimensions are defined dynamically based on system specs.
+def open_window():
+    global WIN, WIDTH, HEIGHT
+
+    pygame.display.init()
+    screen_info = pygame.display.Info()
+    WIDTH, HEIGHT = (screen_info.current_w - 200), (screen_info.current_h - 200)
+    WIN = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption("Planet Simulation")
+    load_images()
+    return WIN
+
+
+# function to close the visualization window, the process stays alive for the next visualization
+def close_window():
+    global WIN
+
+    pygame.display.quit()
+    WIN = None
+
+
+# function to get the images for the current window, they are decoded once per process and scaled and converted once
+# per window size by Assets, so opening the window again does not touch the disk
+def load_images():
+    if 'planet_paths' not in IMAGES:
+        IMAGES['planet_paths'] = Assets.preload(Assets.PLANET_IMAGES)
+
+    IMAGES['background'] = Assets.image(Assets.BACKGROUND_IMAGE, (WIDTH, HEIGHT))
+    IMAGES['earth'] = Assets.image(Assets.EARTH_IMAGE, (EARTH_RADIUS * 2, EARTH_RADIUS * 2), alpha=True)
+    IMAGES['planets'] = [Assets.image(path, (ORBITING_RADIUS * 2, ORBITING_RADIUS * 2), alpha=True)
+                         for path in IMAGES['planet_paths']]
+
 
 # Class to define image sprites of planets for the visualization
 class Planet(pygame.sprite.Sprite):
@@ -27,7 +63,8 @@ class Planet(pygame.sprite.Sprite):
         super().__init__()
         self.lap4_completed = False
         self.image = image
-        self.image = pygame.transform.scale(self.image, (radius * 2, radius * 2))
+        if self.image.get_size() != (radius * 2, radius * 2):
+            self.image = pygame.transform.scale(self.image, (radius * 2, radius * 2))
         self.rect = self.image.get_rect(center=(x, y))
         self.speed = speed
         self.angle = 0
@@ -64,123 +101,251 @@ class Planet(pygame.sprite.Sprite):
         win.blit(self.image, self.rect)
 
 
-# function to initialize and run the visualizer as a pygame process
-def create_visualization_screen(selected_planet, distance, sec_mass, efficiency_index, t, calc, starting_velocity,
-                                num_calc, step):
-    run = True
-    clock = pygame.time.Clock()
-    center_x = WIDTH // 2
-    center_y = HEIGHT // 2
-    p_index = random.randint(1, 6)
-
-    # Load and resize the background image
-    background_image = pygame.image.load("./images/visualization_background.jpg")
-    background_surface = pygame.transform.scale(background_image, (WIDTH, HEIGHT))
-
-    planets_group = pygame.sprite.Group()
-
-    # Create the Earth planet with an image
-    earth_image_path = "./images/earth.png"
-    earth_radius = 30
-    earth_image = pygame.image.load(earth_image_path).convert_alpha()
-    earth = Planet(center_x, center_y, earth_radius, 0, earth_image)
-    planets_group.add(earth)
-
-    # Create the Calculation planet
-    orbiting_image = pygame.image.load(f"./images/planets/planet ({p_index}).png")
-    orbit_speed = 2  # Increase the orbit speed
-    orbiting_planet = Planet(center_x + 150, center_y, 20, orbit_speed, orbiting_image)
-    planets_group.add(orbiting_planet)
-
-    while run:
-        # Check if the user has pressed the window X or the escape key to exit
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                run = False
-                break
-            elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_ESCAPE:
-                    run = False
-                    break
-
-        # Do not execute the logic below if the animation has finished
-        if (orbiting_planet.speed == 0):
-            continue
-
-        orbiting_planet.update(center_x, center_y)
+# Class holding the animation of one set of algorithm results, each one is shown as a tab of the visualization window
+class Visualization:
+    def __init__(self, selected_planet, distance, sec_mass, efficiency_index, t, calc, starting_velocity, num_calc,
+                 step):
+        self.selected_planet = selected_planet
+        self.distance = distance
+        self.sec_mass = sec_mass
+        self.efficiency_index = efficiency_index
+        self.t = t
+        self.calc = calc
+        self.starting_velocity = starting_velocity
+        self.num_calc = num_calc
+        self.step = step
+
+        self.center_x = WIDTH // 2
+        self.center_y = HEIGHT // 2
+
+        self.planets_group = pygame.sprite.Group()
+
+        # Create the Earth planet with an image
+        earth = Planet(self.center_x, self.center_y, EARTH_RADIUS, 0, IMAGES['earth'])
+        self.planets_group.add(earth)
+
+        # Create the Calculation planet
+        orbiting_image = random.choice(IMAGES['planets'])
+        orbit_speed = 2  # Increase the orbit speed
+        self.orbiting_planet = Planet(self.center_x + 150, self.center_y, ORBITING_RADIUS, orbit_speed, orbiting_image)
+        self.planets_group.add(self.orbiting_planet)
+
+        # pre-rendered parts of the frame, see build_scene
+        self.scene = None
+        self.scene_key = None
+        self.message_surfaces = []
+        self.drawn_rects = []
+
+    def is_finished(self):
+        return self.orbiting_planet.speed == 0
+
+    # function to advance the animation by one frame
+    def update(self):
+        self.orbiting_planet.update(self.center_x, self.center_y)
+        self.planets_group.update(self.center_x, self.center_y)
 
-        WIN.blit(background_surface, (0, 0))  # Blit the background image onto the window
-
-        # Planet Orbit Draws as It Revolves around earth
-        for i in range(orbiting_planet.laps_completed + 1):
-            if i < 4:
-                radius = 150 + i * 50
-                ring_color = pygame.Color("red") if i == 3 else pygame.Color("white")
-                pygame.draw.circle(WIN, ring_color, (center_x, center_y), radius, 1)
+        # Increment distance after completing three laps
+        if self.orbiting_planet.laps_completed == 3:
+            self.orbiting_planet.distance_incremented = True
 
-        planets_group.update(center_x, center_y)
-        planets_group.draw(WIN)
+        # Stop orbiting after the fourth lap
+        if self.orbiting_planet.laps_completed == 4:
+            self.orbiting_planet.speed = 0
 
-        # Display algorithm results
+    # function to get the lines of algorithm results shown beside the animation
+    def result_lines(self):
         result_lines = [
-            "Planet Name: {}".format(selected_planet),
-            "Distance from Earth: {} pc".format(distance),
-            "Mass: {} Earth Masses".format(sec_mass),
-            "Calculation Efficiency Index: {}".format(efficiency_index)
+            "Planet Name: {}".format(self.selected_planet),
+            "Distance from Earth: {} pc".format(self.distance),
+            "Mass: {} Earth Masses".format(self.sec_mass),
+            "Calculation Efficiency Index: {}".format(self.efficiency_index)
         ]
-        if orbiting_planet.lap4_completed:
+        if self.orbiting_planet.lap4_completed:
             result_lines.extend((
                 "------------------Algorithm Results------------------",
-                "Expansion Time: {}".format(t),
-                "Calculation Time: {} Seconds".format(str(round(float(calc), 4))),
-                "Number of Calculations: {}".format(num_calc),
-                "Initial Velocity: {} km/s".format(str(round(float(starting_velocity), 4))),
+                "Expansion Time: {}".format(self.t),
+                "Calculation Time: {} Seconds".format(str(round(float(self.calc), 4))),
+                "Number of Calculations: {}".format(self.num_calc),
+                "Initial Velocity: {} km/s".format(str(round(float(self.starting_velocity), 4))),
                 "----------------Calculation Formula------------------",
                 "First iteration of Calculation:",
                 "Hubble Constant = 69.8km/s/Mpc",
                 "Current velocity = Vi",
                 "Vi = Hubble Const. * Mega Parsecs from Earth ",
-                "For {}:".format(selected_planet),
-                "Vi = 69.8 * {}".format(distance),
-                "Therefore Vi = {}".format(str(round(float(starting_velocity), 4))),
-                "Step size = {} Km at Efficiency Index of {} ".format(step, efficiency_index),
+                "For {}:".format(self.selected_planet),
+                "Vi = 69.8 * {}".format(self.distance),
+                "Therefore Vi = {}".format(str(round(float(self.starting_velocity), 4))),
+                "Step size = {} Km at Efficiency Index of {} ".format(self.step, self.efficiency_index),
                 "Time = step / Vi ",
                 "Mpc from Earth = Current distance + Step size",
                 "Recalculate each iteration with new distance ",
                 "and velocity to determine total time."
             ))
+        return result_lines
 
-        result_surface = pygame.Surface((480, len(result_lines) * 30))
+    # function to pre-render everything that does not move: the background, the orbit rings, the earth, the algorithm
+    # results and the tab text. It is rebuilt only when one of them changes, which happens a handful of times per run.
+    def build_scene(self, tab_text):
+        orbiting_planet = self.orbiting_planet
+        scene = IMAGES['background'].copy()
 
-        font = pygame.font.SysFont("Times New Roman", 24)
-        font_color = pygame.Color("white")
+        # Planet Orbit Draws as It Revolves around earth
+        for i in range(orbiting_planet.laps_completed + 1):
+            if i < 4:
+                radius = 150 + i * 50
+                ring_color = pygame.Color("red") if i == 3 else pygame.Color("white")
+                pygame.draw.circle(scene, ring_color, (self.center_x, self.center_y), radius, 1)
 
+        for planet in self.planets_group:
+            if planet is not orbiting_planet:
+                planet.draw(scene)
+
+        # Display algorithm results
+        font = get_font(24)
+        font_color = pygame.Color("white")
+        result_lines = self.result_lines()
+        result_surface = pygame.Surface((480, len(result_lines) * 30))
         for i, line in enumerate(result_lines):
             line_surface = font.render(line, True, font_color)
             result_surface.blit(line_surface, (10, i * 30))
-
-        WIN.blit(result_surface, (10, 100))
+        scene.blit(result_surface, (10, 100))
+
+        # Display which result is shown when more than one calculation has been sent to the window
+        if tab_text is not None:
+            scene.blit(font.render(tab_text, True, font_color), (10, 40))
+
+        # Distance to edge of observable universe, rendered once per message
+        self.message_surfaces = [font.render(line, True, font_color) for line in orbiting_planet.message]
+        self.scene = scene
+
+    # function to draw the current frame of the animation and the algorithm results
+    # returns the rectangles of the window that changed, or None if the whole window was redrawn
+    def draw(self, win, tab_text=None, full=False):
+        orbiting_planet = self.orbiting_planet
+        scene_key = (orbiting_planet.laps_completed, orbiting_planet.lap4_completed, tab_text)
+        if scene_key != self.scene_key:
+            self.scene_key = scene_key
+            self.build_scene(tab_text)
+            full = True
+
+        previous_rects = self.drawn_rects
+        if full:
+            win.blit(self.scene, (0, 0))
+        else:
+            # restore the scene under the moving parts of the last frame
+            for rect in previous_rects:
+                win.blit(self.scene, rect, rect)
+
+        self.drawn_rects = [win.blit(orbiting_planet.image, orbiting_planet.rect)]
 
         # Display distance to edge of observable universe
-        planet_message = font.render(orbiting_planet.message[0], True, pygame.Color("white"))
-        planet_message2 = font.render(orbiting_planet.message[1], True,
-                                      pygame.Color("white"))
         message_x = orbiting_planet.rect.centerx + 10
         message_y = orbiting_planet.rect.centery - 40
+        for surface in self.message_surfaces:
+            self.drawn_rects.append(win.blit(surface, (message_x, message_y)))
+            message_y += surface.get_height()
 
-        WIN.blit(planet_message, (message_x, message_y))
-        WIN.blit(planet_message2, (message_x, message_y + planet_message.get_height()))
-        pygame.display.update()
+        if full:
+            return None
+        return previous_rects + self.drawn_rects
 
-        clock.tick(60)
 
-        # Increment distance after completing three laps
-        if orbiting_planet.laps_completed == 3:
-            orbiting_planet.distance_incremented = True
+# function to initialize and run the visualizer for a single set of results as a pygame process
+def create_visualization_screen(selected_planet, distance, sec_mass, efficiency_index, t, calc, starting_velocity,
+                                num_calc, step):
+    results = queue.Queue()
+    results.put(dict(selected_planet=selected_planet, distance=distance, sec_mass=sec_mass,
+                     efficiency_index=efficiency_index, t=t, calc=calc, starting_velocity=starting_velocity,
+                     num_calc=num_calc, step=step))
+    run_visualizer(results, keep_alive=False)
+
+
+# function to run the long-lived visualizer. Results arrive on the queue as dictionaries of the visualization
+# parameters and are shown as tabs of one window, Left and Right switch between them. The window is closed with the X
+# or the escape key and reopened for the next result, None on the queue stops the visualizer. Without keep_alive the
+# visualizer stops when the window is closed.
+def run_visualizer(results, keep_alive=True):
+    pygame.init()
+    # decode the images while waiting for the first results, so the first window opens without reading them
+    Assets.preload((Assets.BACKGROUND_IMAGE, Assets.EARTH_IMAGE) + Assets.PLANET_IMAGES)
+    clock = pygame.time.Clock()
+    tabs = []
+    current = 0
+    running = True
+
+    while running:
+        # wait for the next result while no window is open
+        if WIN is None:
+            result = results.get()
+            if result is None:
+                break
+            open_window()
+            tabs = [Visualization(**result)]
+            current = 0
+
+        # pick up results sent while the window is open, each one opens in a new tab
+        try:
+            while True:
+                result = results.get_nowait()
+                if result is None:
+                    running = False
+                    break
+                tabs.append(Visualization(**result))
+                current = len(tabs) - 1
+        except queue.Empty:
+            pass
+
+        # once the animation has finished nothing changes until the system or the user asks for it, so block on the
+        # event queue instead of polling. The timeout picks up results sent from the application.
+        if tabs[current].is_finished():
+            events = [pygame.event.wait(IDLE_TIMEOUT_MS)] + pygame.event.get()
+        else:
+            events = pygame.event.get()
+
+        redraw = False
+        # Check if the user has pressed the window X or the escape key to exit
+        for event in events:
+            if event.type in REDRAW_EVENTS:
+                # the window was uncovered or resized, its contents need to be drawn again
+                redraw = True
+            elif event.type == pygame.QUIT:
+                close_window()
+                break
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE:
+                    close_window()
+                    break
+                elif event.key == pygame.K_LEFT and current > 0:
+                    current -= 1
+                    redraw = True
+                elif event.key == pygame.K_RIGHT and current < len(tabs) - 1:
+                    current += 1
+                    redraw = True
+
+        if WIN is None:
+            if not keep_alive:
+                running = False
+            continue
 
-        # Stop orbiting after the fourth lap
-        if orbiting_planet.laps_completed == 4:
-            orbiting_planet.speed = 0
+        visualization = tabs[current]
+        # Do not execute the logic below if the animation has finished
+        if visualization.is_finished() and not redraw:
+            continue
+
+        if not visualization.is_finished():
+            visualization.update()
+
+        tab_text = None
+        if len(tabs) > 1:
+            tab_text = "Result {} of {} (Left / Right to switch)".format(current + 1, len(tabs))
+        # only the parts of the window that changed are sent to the display
+        dirty_rects = visualization.draw(WIN, tab_text, full=redraw)
+        if dirty_rects is None:
+            pygame.display.update()
+        else:
+            pygame.display.update(dirty_rects)
+
+        clock.tick(60)
 
     pygame.quit()
 
@@ -0,0 +1,94 @@
+from collections import OrderedDict
+import dbm
+import json
+import os
+import shelve
+import threading
+
+RESULT_CACHE_SIZE = 256  # Number of results kept in memory before the least recently used is dropped
+RESULT_CACHE_PATH = "cache/results"  # Shelf the results are kept in between runs, None keeps them in memory only
+RESULT_CACHE_SYNC = 64  # Results written to the shelf between flushes to disk, the shelf is also flushed on close
+
+
+# Class that remembers the results of expansion calculations. Results are looked up by a key that starts with the
+# planet name and distance followed by every setting that changes the result, see Calculation.key. Recently used
+# results are kept in memory, and every result is also written to a shelf on disk so it survives a restart.
+# The cache is used from the calculation worker and from the Tk thread, which invalidates results when a refreshed
+# catalog is swapped in, so every access holds a lock.
+class ResultCache:
+    def __init__(self, path=RESULT_CACHE_PATH, size=RESULT_CACHE_SIZE, sync_every=RESULT_CACHE_SYNC):
+        self.size = size
+        self.sync_every = sync_every
+        self.unsynced = 0  # results written to the shelf since it was last flushed
+        self.memory = OrderedDict()
+        self.lock = threading.Lock()
+        self.shelf = None
+
+        # a cache that cannot be opened only means results are recalculated after a restart
+        if path is not None:
+            try:
+                directory = os.path.dirname(path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                self.shelf = shelve.open(path)
+            except (OSError, dbm.error) as e:
+                print(f"Unable to open the result cache {path}: {e}")
+
+    # shelf keys must be strings, the key tuple only holds names and numbers so it is stored as JSON
+    @staticmethod
+    def shelf_key(key):
+        return json.dumps(key)
+
+    # function to get a cached result, None if the key has not been calculated
+    def get(self, key):
+        with self.lock:
+            if key in self.memory:
+                self.memory.move_to_end(key)
+                return self.memory[key]
+            if self.shelf is None:
+                return None
+
+            result = self.shelf.get(self.shelf_key(key))
+            if result is not None:
+                self.remember(key, result)
+            return result
+
+    def put(self, key, result):
+        with self.lock:
+            self.remember(key, result)
+            if self.shelf is not None:
+                self.shelf[self.shelf_key(key)] = result
+                # flushing rewrites the whole index of the shelf, so it is done in batches rather than on every result
+                self.unsynced += 1
+                if self.unsynced >= self.sync_every:
+                    self.sync()
+
+    # function to store a result in memory and evict the least recently used results past the cache size
+    def remember(self, key, result):
+        self.memory[key] = result
+        while len(self.memory) > self.size:
+            self.memory.popitem(last=False)
+
+    # function to drop every cached result of the given planet names, used when a catalog refresh changes them
+    def invalidate(self, names):
+        names = set(names)
+        if not names:
+            return
+        with self.lock:
+            for key in [key for key in self.memory if key[0] in names]:
+                del self.memory[key]
+            if self.shelf is not None:
+                for key in [key for key in self.shelf.keys() if json.loads(key)[0] in names]:
+                    del self.shelf[key]
+                self.sync()
+
+    # function to flush the shelf to disk, the lock must be held
+    def sync(self):
+        self.shelf.sync()
+        self.unsynced = 0
+
+    def close(self):
+        with self.lock:
+            if self.shelf is not None:
+                self.shelf.close()
+                self.shelf = None
@@ -0,0 +1,153 @@
+import argparse
+import concurrent.futures
+import csv
+import os
+import time
+import numpy
+import Expansion
+from CLI import add_filter_arguments, check_efficiency_index, filter_planets, load_model
+
+SWEEP_CHUNK_SIZE = 256  # Planets in one work unit sent to a worker process
+SWEEP_IN_FLIGHT = 4  # Work units queued per worker process, more only use memory
+SWEEP_COLUMNS = ('name', 'distance', 'hubble_constant', 'efficiency_index', 'engine', 'time', 'num_calc', 'step')
+
+
+# function run in a worker process for one work unit: a chunk of planets at one hubble constant and efficiency index
+# returns one row per planet in the order of SWEEP_COLUMNS
+def sweep_unit(engine, hubble_constant, efficiency_index, max_distance, names, distances):
+    if engine == Expansion.ENGINE_ANALYTIC:
+        # the closed form works on the whole chunk at once
+        result = Expansion.batch_expansion(distances, efficiency_index, hubble_constant, max_distance)
+        times = result['time'].tolist()
+        num_calcs = [1] * len(names)
+        steps = [None] * len(names)
+    else:
+        times, num_calcs, steps = [], [], []
+        for distance in distances.tolist():
+            if engine == Expansion.ENGINE_ADAPTIVE:
+                result = Expansion.adaptive_expansion(distance, Expansion.tolerance_from_index(efficiency_index),
+                                                      hubble_constant, max_distance)
+            elif engine == Expansion.ENGINE_MONTE_CARLO:
+                result = Expansion.monte_carlo_expansion(distance, Expansion.samples_from_index(efficiency_index),
+                                                         hubble_constant, max_distance)
+            else:
+                result = Expansion.iterative_expansion(distance, efficiency_index, hubble_constant, max_distance)
+            times.append(result['time'])
+            num_calcs.append(result['num_calc'])
+            steps.append(result['step'])
+
+    return [(name, distance, hubble_constant, efficiency_index, engine, t, num_calc, step)
+            for name, distance, t, num_calc, step in zip(names, distances.tolist(), times, num_calcs, steps)]
+
+
+# generator of the work units of a sweep: every chunk of planets at every combination of the grid
+def sweep_units(names, distances, hubble_constants, efficiency_indices, chunk_size=SWEEP_CHUNK_SIZE):
+    distances = numpy.asarray(distances, dtype=numpy.float64)
+    for hubble_constant in hubble_constants:
+        for efficiency_index in efficiency_indices:
+            for start in range(0, len(names), chunk_size):
+                yield (hubble_constant, efficiency_index, names[start:start + chunk_size],
+                       distances[start:start + chunk_size])
+
+
+# function that calculates the expansion of every planet at every hubble constant and efficiency index of the grid
+# on a pool of worker processes. Rows are written to a CSV file at path as soon as their work unit finishes, so the
+# order of the rows follows the order the units finished in. Returns the number of rows, the time taken in seconds
+# and the throughput in planet configurations per second.
+def run_sweep(names, distances, hubble_constants, efficiency_indices, path, engine=Expansion.ENGINE_ITERATIVE,
+              max_distance=Expansion.MAX_DISTANCE, workers=None, chunk_size=SWEEP_CHUNK_SIZE, report=print):
+    workers = workers or os.cpu_count() or 1
+    units = sweep_units(names, distances, hubble_constants, efficiency_indices, chunk_size)
+    total = len(names) * len(hubble_constants) * len(efficiency_indices)
+
+    rows = 0
+    reported = 0  # tenths of the sweep reported so far
+    start_time = time.perf_counter()
+    with open(path, 'w', newline='') as output, concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        writer = csv.writer(output)
+        writer.writerow(SWEEP_COLUMNS)
+
+        # only a few units per worker are submitted at a time, the next one is submitted as each one finishes
+        running = set()
+        for unit in units:
+            running.add(pool.submit(sweep_unit, engine, unit[0], unit[1], max_distance, *unit[2:]))
+            if len(running) >= workers * SWEEP_IN_FLIGHT:
+                done, running = concurrent.futures.wait(running, return_when=concurrent.futures.FIRST_COMPLETED)
+                rows += write_units(writer, done)
+                if rows * 10 // total > reported:
+                    reported = rows * 10 // total
+                    report(f"{rows} of {total} planet configurations done")
+        rows += write_units(writer, concurrent.futures.as_completed(running))
+
+    elapsed = time.perf_counter() - start_time
+    throughput = rows / elapsed if elapsed > 0 else float('inf')
+    report(f"Sweep of {rows} planet configurations on {workers} processes finished in {elapsed:.2f} seconds, "
+           f"{throughput:.1f} planet configurations per second")
+    return {'rows': rows, 'seconds': elapsed, 'throughput': throughput}
+
+
+# function to write the rows of finished work units, returns the number of rows written
+def write_units(writer, futures):
+    rows = 0
+    for future in futures:
+        unit_rows = future.result()
+        writer.writerows(unit_rows)
+        rows += len(unit_rows)
+    return rows
+
+
+# function to parse a grid of values, either a list ("67,69.8,74") or an inclusive range with a step ("67:74:0.5")
+# raises ValueError if the value is not a list or range of numbers, or the range is empty
+def parse_grid(value, kind=float):
+    if ':' in value:
+        start, stop, step = (float(part) for part in value.split(':'))
+        if step <= 0:
+            raise ValueError(f"the step of {value} must be greater than 0")
+        if stop < start:
+            raise ValueError(f"the end of {value} must not be less than its start")
+        count = int(round((stop - start) / step)) + 1
+        return [kind(start + step * i) for i in range(count)]
+    grid = [kind(part) for part in value.split(',') if part.strip()]
+    if not grid:
+        raise ValueError(f"{value} has no values")
+    return grid
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Calculate the expansion time of every planet over a grid of "
+                                                 "hubble constants and efficiency indices")
+    parser.add_argument('output', help="CSV file the results are written to")
+    parser.add_argument('--hubble', default="67:74:1", help="hubble constants in km/s/Mpc, a list or start:stop:step")
+    parser.add_argument('--efficiency', default="1", help="efficiency indices, a list or start:stop:step")
+    parser.add_argument('--engine', default=Expansion.ENGINE_ITERATIVE, choices=Expansion.ENGINES)
+    parser.add_argument('--max-distance', type=float, default=Expansion.MAX_DISTANCE,
+                        help="distance to the observable universe edge in KM")
+    add_filter_arguments(parser)
+    parser.add_argument('--workers', type=int, help="worker processes, defaults to one per core")
+    parser.add_argument('--chunk-size', type=int, default=SWEEP_CHUNK_SIZE, help="planets per work unit")
+    args = parser.parse_args(argv)
+
+    try:
+        hubble_constants = parse_grid(args.hubble)
+        efficiency_indices = parse_grid(args.efficiency, int)
+    except ValueError as e:
+        parser.error('grids must be a list such as 67,69.8,74 or a range such as 67:74:1: ' + str(e))
+    try:
+        for efficiency_index in efficiency_indices:
+            check_efficiency_index(efficiency_index)
+    except ValueError as e:
+        parser.error(str(e))
+
+    # the planets come from the application's catalog and filters
+    model = load_model(None)
+    try:
+        indices = filter_planets(model, args)
+    except ValueError as e:
+        parser.error(str(e))
+    names = [model.catalog.names[index] for index in indices.tolist()]
+    run_sweep(names, model.catalog.distance[indices], hubble_constants, efficiency_indices,
+              args.output, args.engine, args.max_distance, args.workers, args.chunk_size)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,147 @@
+import queue
+import threading
+import time
+from LazyImport import LazyModule
+
+# media libraries are only needed by the tutorial, they are imported when it is first played
+cv2 = LazyModule("cv2")
+ffpyplayer_player = LazyModule("ffpyplayer.player")
+
+TUTORIAL_PATH = "videos/tutorial.mp4"
+WINDOW_NAME = "SandGlass Tutorial"
+WINDOW_SIZE = (1200, 800)
+DECODE_AHEAD = 30  # Number of decoded frames waiting to be shown before the decoder pauses
+EVENT_POLL_MS = 15  # Longest time between checks of the window for the q key or the close button
+
+
+# Class that plays the tutorial video in its own window. Frames are decoded by cv2 on a worker thread into a bounded
+# queue, and the Tk event loop shows each one when its timestamp is reached on the audio clock of the ffpyplayer
+# media player, so the app stays responsive and the video stays in sync with the sound. Frames that are already late
+# are skipped rather than shown late.
+class TutorialPlayer:
+    def __init__(self, path=TUTORIAL_PATH, decode_ahead=DECODE_AHEAD):
+        self.path = path
+        self.frames = queue.Queue(maxsize=decode_ahead)
+        self.stopped = threading.Event()
+        self.decoder = None
+        self.audio = None
+        self.widget = None
+        self.start_time = None
+        # next decoded (timestamp, frame) waiting for its time to be shown, and whether the decoder reached the end
+        self.pending = None
+        self.ended = False
+
+    # function to open the video and start playback, widget is any Tk widget and is used to schedule the frames
+    def start(self, widget):
+        self.widget = widget
+        video = cv2.VideoCapture(self.path)
+
+        # the media player only plays the audio, the video is decoded by cv2
+        self.audio = ffpyplayer_player.MediaPlayer(self.path, ff_opts={'vn': True})
+        self.start_time = time.perf_counter()
+
+        # define the video player window parameters
+        cv2.namedWindow(WINDOW_NAME, cv2.WINDOW_NORMAL)
+        cv2.resizeWindow(WINDOW_NAME, WINDOW_SIZE)
+
+        self.decoder = threading.Thread(target=self.decode, args=(video,), name="tutorial-decoder", daemon=True)
+        self.decoder.start()
+        self.widget.after(0, self.present)
+
+    def is_playing(self):
+        return self.decoder is not None and not self.stopped.is_set()
+
+    # function run by the decoder thread, reads frames with their presentation time in seconds until the video ends
+    # or playback is stopped. None marks the end of the video.
+    def decode(self, video):
+        try:
+            while not self.stopped.is_set():
+                grabbed, frame = video.read()
+                if not grabbed:
+                    break
+                self.put((video.get(cv2.CAP_PROP_POS_MSEC) / 1000, frame))
+        finally:
+            video.release()
+            self.put(None)
+
+    # function to wait for room in the frame queue, giving up once playback is stopped
+    def put(self, item):
+        while not self.stopped.is_set():
+            try:
+                self.frames.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    # function to get the playback position in seconds, the audio clock once the sound has started and the time since
+    # playback started before that
+    def clock(self):
+        pts = self.audio.get_pts()
+        if pts and pts == pts:  # 0 until the first audio frame plays and NaN if there is no audio
+            return pts
+        return time.perf_counter() - self.start_time
+
+    # function to move the next decoded frame into pending, returns False if none is ready
+    def fetch(self):
+        try:
+            item = self.frames.get_nowait()
+        except queue.Empty:
+            return False
+        if item is None:
+            self.ended = True
+            return False
+        self.pending = item
+        return True
+
+    # function scheduled on the Tk event loop to show the frame that is due and schedule itself for the next one
+    def present(self):
+        if self.stopped.is_set():
+            return
+
+        # detection conditions for manual 'QUIT' of the tutorial video
+        try:
+            # if property returns -1 the window has closed this will throw a benign exception
+            # so stop the playback inside the exception catch
+            if cv2.getWindowProperty(WINDOW_NAME, 1) == -1:
+                self.stop()
+                return
+        except Exception as e:
+            self.stop()
+            return
+
+        # show the latest frame that is due, the ones before it are late and are skipped
+        now = self.clock()
+        due = None
+        while self.pending is not None or self.fetch():
+            pts, frame = self.pending
+            if pts > now:
+                break
+            due = frame
+            self.pending = None
+
+        if due is not None:
+            cv2.imshow(WINDOW_NAME, due)
+
+        # if no frames are left the video is finished, exit playback
+        if self.ended and self.pending is None:
+            self.stop()
+            return
+
+        # let cv2 process its window events, the q key ends playback
+        if cv2.waitKey(1) & 0xFF == ord("q"):
+            self.stop()
+            return
+
+        # wake up when the next frame is due, or soon if it has not been decoded yet
+        delay = EVENT_POLL_MS
+        if self.pending is not None:
+            delay = min(max(int((self.pending[0] - self.clock()) * 1000), 1), EVENT_POLL_MS)
+        self.widget.after(delay, self.present)
+
+    # function to stop playback and release and close the audio and window, the decoder releases the video
+    def stop(self):
+        if self.stopped.is_set():
+            return
+        self.stopped.set()
+        self.audio.close_player()
+        cv2.destroyAllWindows()
@@ -1,10 +1,8 @@
-import subprocess
 import tkinter
 from tkinter import ttk, PhotoImage, scrolledtext
-import pygame as pygame
-from PIL import Image, ImageTk
-from ffpyplayer.player import MediaPlayer
-import cv2
+from ImageCache import resized_photo
+from TutorialPlayer import TutorialPlayer
+from Visualizer import Visualizer
 
 
 # View class Main Layout and Widgets of GUI
@@ -26,12 +24,19 @@ class View(ttk.Frame):
         self.name_submit_button = None
         self.range_submit_button = None
         self.mass_submit_button = None
+        self.calculation_progress = None
         self.slider_submit_button = None
         self.efficiency_slider = None
+        self.engine_selection = None
+        self.engine_dropdown = None
 
         # empty reference will be set after controller is instantiated in APP
         self.controller = None
 
+        # long-lived process that shows the results of every calculation
+        self.visualizer = Visualizer()
+        self.tutorial_player = None
+
         # Define the parent frame size
         self.WIDTH = self.winfo_screenwidth() - 100
         self.HEIGHT = self.winfo_screenheight() - 100
@@ -55,32 +60,24 @@ class View(ttk.Frame):
         self.console_frame = ttk.Frame(self, height=self.CONSOLE_FRAME_HEIGHT, width=self.WIDTH)
 
         # Set menu background
-        self.menu_image = Image.open("images/menu.jpg")
-        self.menu_image = self.menu_image.resize((self.MENU_FRAME_WIDTH, self.MENU_FRAME_HEIGHT))
-        self.menu_photo = ImageTk.PhotoImage(self.menu_image)
+        self.menu_photo = resized_photo("images/menu.jpg", (self.MENU_FRAME_WIDTH, self.MENU_FRAME_HEIGHT))
         self.menu_label = ttk.Label(self.menu_frame, image=self.menu_photo)
         # self.menu_label.place(relx=0, rely=0, relwidth=1, relheight=1)
         self.menu_label.grid(row=0, column=0, sticky="nsew")
 
         # Set Menu Logo
-        self.logo_image = Image.open("images/logo.jpg")
-        self.logo_image = self.logo_image.resize((self.LOGO_WIDTH, self.LOGO_HEIGHT))
-        self.logo_photo = ImageTk.PhotoImage(self.logo_image)
+        self.logo_photo = resized_photo("images/logo.jpg", (self.LOGO_WIDTH, self.LOGO_HEIGHT))
         self.logo_label = ttk.Label(self.menu_frame, image=self.logo_photo)
         self.logo_label.place(relx=0, rely=0, relwidth=0.26, relheight=0.128)
 
         # Set Mission statement background
-        self.mission_statement_image = Image.open("images/mission.jpg")
-        self.mission_statement_image = self.mission_statement_image.resize(
-            (self.MISSION_STATEMENT_WIDTH, self.MISSION_STATEMENT_HEIGHT))
-        self.mission_statement_photo = ImageTk.PhotoImage(self.mission_statement_image)
+        self.mission_statement_photo = resized_photo("images/mission.jpg",
+                                                     (self.MISSION_STATEMENT_WIDTH, self.MISSION_STATEMENT_HEIGHT))
         self.mission_statement_label = ttk.Label(self.menu_frame, image=self.mission_statement_photo)
         self.mission_statement_label.place(relx=0.25, rely=0, relwidth=0.75, relheight=0.128)
 
         # set filter frame background
-        self.filter_image = Image.open("images/galaxy.jpg")
-        self.filter_image = self.filter_image.resize((self.FILTER_FRAME_WIDTH, self.FILTER_FRAME_HEIGHT))
-        self.filter_photo = ImageTk.PhotoImage(self.filter_image)
+        self.filter_photo = resized_photo("images/galaxy.jpg", (self.FILTER_FRAME_WIDTH, self.FILTER_FRAME_HEIGHT))
 
         # using canvas for filter, so we can write text on it without background containers
         self.filter_canvas = tkinter.Canvas(self.filter_frame, width=self.FILTER_FRAME_WIDTH,
@@ -195,6 +192,19 @@ class View(ttk.Frame):
 
         calculate_button.place(relx=0.05, rely=0.85, relwidth=0.9, relheight=0.05)
 
+        # progress of the running calculation and a button to cancel it and the queued ones
+        self.calculation_progress = ttk.Progressbar(self.menu_frame, orient="horizontal", mode="determinate",
+                                                    maximum=100)
+        self.calculation_progress.place(relx=0.05, rely=0.91, relwidth=0.6, relheight=0.03)
+
+        cancel_button = tkinter.Button(self.menu_frame, text="Cancel", bd=3, relief="raised",
+                                       borderwidth=3, highlightthickness=0,
+                                       font=("Arial", 12, "bold"),
+                                       background="red",
+                                       command=self.controller.cancel_algorithm
+                                       )
+        cancel_button.place(relx=0.7, rely=0.91, relwidth=0.25, relheight=0.03)
+
         # //// FILTER WIDGETS /////////////////////////////////////////////////////////////////////////////////////////
 
         # this is spaced due to pythons desire to ratio everything, the spacing will line up the labels
@@ -233,6 +243,8 @@ class View(ttk.Frame):
         self.name_input = tkinter.Entry(self.filter_canvas, font=input_font, width=input_width, justify="center")
         # self.name_input.place(x=self.FILTER_FRAME_WIDTH / 2.5 + 10, y=input_y1, anchor="w", height=40)  # Exact place
         self.name_input.place(relx=0.4, rely=0.29, relheight=0.05, relwidth=0.3)  # relative placing
+        # update the drop down list with matching planets as the user types
+        self.name_input.bind("<KeyRelease>", self.controller.suggest_names)
 
         self.range_input = tkinter.Entry(self.filter_canvas, font=input_font, width=input_width, justify="center")
         # self.range_input.place(x=self.FILTER_FRAME_WIDTH / 2.5 + 10, y=input_y2, anchor="w", height=40) # Exact place
@@ -273,6 +285,15 @@ class View(ttk.Frame):
                                                font=("Arial", 12, "bold"))
         self.efficiency_slider.place(relx=0.4, rely=0.82, relwidth=0.3, relheight=0.05)
 
+        # draw the calculation engine selection box below the efficiency slider
+        self.engine_selection = tkinter.StringVar()
+        self.engine_selection.set(self.controller.get_engine())
+        self.engine_dropdown = ttk.Combobox(self.filter_frame, textvariable=self.engine_selection,
+                                            values=self.controller.get_engines(), state="readonly")
+        self.engine_dropdown.config(font=('Arial', 12), justify='center')
+        self.engine_dropdown.place(relx=0.4, rely=0.89, relwidth=0.3, relheight=0.04)
+        self.engine_dropdown.bind("<<ComboboxSelected>>", self.controller.submit_engine)
+
     # //// VIEW FUNCTIONS //////////////////////////////////////////////////////////////////////////////////////////////
 
     # assign controller value to view
@@ -280,69 +301,27 @@ class View(ttk.Frame):
         self.controller = controller
 
     # instantiate a pygame window for the purposes of visualization. This could change over development time
-    def create_visualization_screen(self, t, calc, starting_velocity, num_calc, step):
-        # retrieve planet from model
-        selected_planet = self.controller.get_selected_planet()
-        efficiency_index = self.controller.get_efficiency_index()
+    def create_visualization_screen(self, t, calc, starting_velocity, num_calc, step, selected_planet=None,
+                                    efficiency_index=None):
+        # retrieve planet from model unless the results say which planet and efficiency index they were calculated for
+        if selected_planet is None:
+            selected_planet = self.controller.get_selected_planet()
+        if efficiency_index is None:
+            efficiency_index = self.controller.get_efficiency_index()
 
-        # ensure planet was passed, if object does not exist stop function and do not instantiate pygame        time_in_billions_of_years:.2f
+        # ensure planet was passed, if object does not exist stop function and do not instantiate pygame
         if selected_planet is None:
             return
         else:
-            # Retrieve the parameters you want to send
-            subprocess.Popen(['python', 'Planet_Simulation.py', str(selected_planet), str(efficiency_index),
-                              str(selected_planet.mass), str(selected_planet.distance), str(t), str(calc),
-                              str(starting_velocity), str(num_calc), str(step)])
-
-    # View method to instantiate a media player and playback video capture / audio using the cv2 library for the
-    # purposes of the SandGlass in application tutorial video
-    @staticmethod
-    def play_tutorial():
-
-        # define pathing for the desired Mp4 video in project directory
-        video_path = "videos/tutorial.mp4"
-
-        # assign the file to the video capture class in order to pull frames of the video file
-        video = cv2.VideoCapture(video_path)
-        # instantiate ffpyplayer media player object for audio video playback
-        player = MediaPlayer(video_path)
-
-        # define the video player window parameters
-        window_size = (1200, 800)
-        cv2.namedWindow("SandGlass Tutorial", cv2.WINDOW_NORMAL)
-        cv2.resizeWindow("SandGlass Tutorial", window_size)
-
-        # infinite loop for video playback
-        while True:
-
-            # select next video and audio frame from video file
-            grabbed, frame = video.read()
-            audio_frame, val = player.get_frame()
-
-            # if no frames exist the video file is finished exit playback
-            if not grabbed:
-                break
-
-            # define framerate of playback to synchronize audio and video frames
-            if cv2.waitKey(39) & 0xFF == ord("q"):
-                break
-
-            # detection conditions for manual 'QUIT' of the tutorial video
-            try:
-                # if property returns -1 the window has closed this will throw a benign exception
-                # so break the playback loop inside the exception catch
-                if cv2.getWindowProperty("SandGlass Tutorial", 1) == -1:
-                    break
-            except Exception as e:
-                break
-
-            # display current frame to media player window frame
-            cv2.imshow("SandGlass Tutorial", frame)
-
-            if val != 'eof' and audio_frame is not None:
-                img, t = audio_frame
-
-        # release and close Video / Audio / Playback components
-        video.release()
-        player.close_player()
-        cv2.destroyAllWindows()
+            # Send the parameters to the visualizer process, which opens them as a new tab of its window
+            self.visualizer.show(str(selected_planet), str(selected_planet.distance), str(selected_planet.mass),
+                                 str(efficiency_index), str(t), str(calc), str(starting_velocity), str(num_calc),
+                                 str(step))
+
+    # View method to play the SandGlass in application tutorial video, the video is decoded in the background and its
+    # frames are shown from the Tk event loop so the application stays responsive. Only one tutorial plays at a time.
+    def play_tutorial(self):
+        if self.tutorial_player is not None and self.tutorial_player.is_playing():
+            return
+        self.tutorial_player = TutorialPlayer()
+        self.tutorial_player.start(self)
@@ -0,0 +1,41 @@
+import multiprocessing
+
+
+# function run in the visualizer process, pygame is imported there so the application process never loads it
+def visualizer_main(results):
+    import Planet_Simulation
+    Planet_Simulation.run_visualizer(results)
+
+
+# Class that owns the long-lived visualizer process. The process is started once, pays for the interpreter, pygame
+# and image loading a single time, and then shows every calculation sent to it over the results queue.
+class Visualizer:
+    def __init__(self):
+        self.process = None
+        self.results = None
+
+    # function to start the visualizer process if it is not already running
+    def start(self):
+        if self.process is not None and self.process.is_alive():
+            return
+        # spawn gives the visualizer a clean interpreter without the Tk state of the application
+        context = multiprocessing.get_context("spawn")
+        self.results = context.Queue()
+        self.process = context.Process(target=visualizer_main, args=(self.results,), name="visualizer", daemon=True)
+        self.process.start()
+
+    # function to send a set of visualization parameters to the visualizer, it opens as a new tab of the window
+    def show(self, selected_planet, distance, sec_mass, efficiency_index, t, calc, starting_velocity, num_calc, step):
+        self.start()
+        self.results.put(dict(selected_planet=selected_planet, distance=distance, sec_mass=sec_mass,
+                              efficiency_index=efficiency_index, t=t, calc=calc, starting_velocity=starting_velocity,
+                              num_calc=num_calc, step=step))
+
+    # function to stop the visualizer process when the application closes
+    def close(self):
+        if self.process is None:
+            return
+        if self.process.is_alive():
+            self.results.put(None)
+            self.process.join(timeout=2)
+        self.process = None
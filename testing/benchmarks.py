@@ -0,0 +1,111 @@
+import os
+import subprocess
+import sys
+import tempfile
+import timeit
+
+# run from anywhere, the benchmarks import the application modules from the project directory
+PROJECT_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_DIRECTORY)
+os.chdir(PROJECT_DIRECTORY)
+
+from Catalog import PlanetCatalog, read_catalog_csv, load_snapshot, write_snapshot, SEED_PATH
+
+
+# the catalog start up path used before the single pass ingester: pandas reads the CSV twice, scans every row for
+# the header and converts the frame to records before the catalog is built
+def pandas_catalog(csv_name=SEED_PATH):
+    import pandas
+
+    nasa_data_frame = pandas.read_csv(csv_name)
+    if 'name' in nasa_data_frame.columns:
+        nasa_data_frame = pandas.read_csv(csv_name)
+
+    header_row = None
+    for i in range(len(nasa_data_frame)):
+        row = nasa_data_frame.loc[i]
+        if 'name' in row.values and 'mass' in row.values and 'distance' in row.values:
+            header_row = i
+            break
+    if header_row is not None:
+        nasa_data_frame.columns = nasa_data_frame.loc[header_row]
+
+    planet_data = nasa_data_frame.to_dict('records')
+    return PlanetCatalog.from_rows(data for data in planet_data if data['name'] != 'name')
+
+
+# function to time a benchmark and print the best time of the repeats in milliseconds
+def report(label, function, number=5, repeat=5):
+    best = min(timeit.repeat(function, number=number, repeat=repeat)) / number
+    print(f"{label:<40}{best * 1000:10.2f} ms")
+    return best
+
+
+def benchmark_catalog_parse():
+    print("Catalog parse of " + SEED_PATH)
+    import pandas  # imported up front so the pandas timings do not include the import
+    legacy = report("pandas read_csv and header scan", pandas_catalog)
+    ingester = report("single pass ingester", read_catalog_csv)
+    print(f"{'speed up':<40}{legacy / ingester:10.2f} x")
+
+
+def benchmark_catalog_snapshot():
+    print("Catalog cold start from the binary snapshot")
+    with tempfile.TemporaryDirectory() as directory:
+        snapshot_path = os.path.join(directory, "catalog.bin")
+        write_snapshot(read_catalog_csv(), SEED_PATH, snapshot_path)
+        ingester = report("single pass ingester", read_catalog_csv)
+        snapshot = report("memory mapped snapshot", lambda: load_snapshot(SEED_PATH, snapshot_path))
+    print(f"{'speed up':<40}{ingester / snapshot:10.2f} x")
+
+
+# function to import a module in a fresh interpreter with -X importtime and get the cumulative import time in
+# microseconds of every module it imported
+def import_times(module):
+    process = subprocess.run([sys.executable, "-X", "importtime", "-c", "import " + module],
+                             capture_output=True, text=True, cwd=PROJECT_DIRECTORY)
+    times = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+# modules that must stay off the start up path, they are imported when the screen that needs them is opened
+LAZY_MODULES = ("pygame", "cv2", "ffpyplayer", "pandas", "requests", "PIL")
+
+
+def benchmark_import_time(top=10):
+    print("Import time of App, similar to python -X importtime")
+    times = import_times("App")
+    for name, cumulative in sorted(times.items(), key=lambda item: item[1], reverse=True)[:top]:
+        print(f"{name:<40}{cumulative / 1000:10.2f} ms")
+
+    eager = [name for name in LAZY_MODULES if name in times]
+    if eager:
+        print("REGRESSION: imported at start up: " + ", ".join(eager))
+
+
+# modules that must never be imported by the command line entry point, it has to run without a display
+GUI_MODULES = ("tkinter", "pygame", "cv2", "ffpyplayer", "PIL")
+
+
+def benchmark_cli_startup(repeat=5):
+    print("Command line start up, one analytic result")
+    command = [sys.executable, "CLI.py", "--engine", "analytic", "--no-cache", "11 Com b"]
+    best = min(timeit.repeat(lambda: subprocess.run(command, capture_output=True, cwd=PROJECT_DIRECTORY),
+                             number=1, repeat=repeat))
+    print(f"{'CLI.py to first result':<40}{best * 1000:10.2f} ms")
+
+    gui = [name for name in GUI_MODULES if name in import_times("CLI")]
+    if gui:
+        print("REGRESSION: imported by the command line: " + ", ".join(gui))
+
+
+if __name__ == '__main__':
+    benchmark_catalog_parse()
+    benchmark_catalog_snapshot()
+    benchmark_import_time()
+    benchmark_cli_startup()
@@ -0,0 +1,127 @@
+import http.server
+import json
+import os
+import sys
+import tempfile
+import threading
+import unittest
+
+# run from anywhere, the tests import the application modules from the project directory
+PROJECT_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_DIRECTORY)
+
+from Catalog import CatalogCache
+from Model import Model
+
+SEED_PATH = os.path.join(PROJECT_DIRECTORY, "NASA_PRODUCTION.csv")
+ARCHIVE_ROWS = [
+    {'pl_name': "Test-1 b", 'pl_bmasse': 1.5, 'sy_dist': 10.0},
+    {'pl_name': "Test-2 c", 'pl_bmasse': 300.0, 'sy_dist': 250.5},
+]
+ETAG = '"catalog-1"'
+
+
+# Stand-in for the NASA Exoplanet Archive TAP endpoint. It answers every query with ARCHIVE_ROWS, sends an ETag if
+# send_etag is set, and answers 304 when the request carries that ETag.
+class ArchiveHandler(http.server.BaseHTTPRequestHandler):
+    rows = ARCHIVE_ROWS
+    send_etag = True
+    requests = 0
+
+    def do_GET(self):
+        ArchiveHandler.requests += 1
+        if self.send_etag and self.headers.get('If-None-Match') == ETAG:
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        body = json.dumps(self.rows).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        if self.send_etag:
+            self.send_header('ETag', ETAG)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class CatalogRefreshTest(unittest.TestCase):
+
+    def setUp(self):
+        ArchiveHandler.rows = ARCHIVE_ROWS
+        ArchiveHandler.send_etag = True
+        ArchiveHandler.requests = 0
+        self.server = http.server.HTTPServer(("127.0.0.1", 0), ArchiveHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/TAP/sync"
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache_path = os.path.join(self.directory.name, "catalog.json")
+        self.snapshot_path = os.path.join(self.directory.name, "catalog.bin")
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.directory.cleanup()
+
+    # function to start the model against the stand-in archive and wait for its refresh to finish
+    def start_model(self, ttl=0):
+        cache = CatalogCache(path=self.cache_path, ttl=ttl, url=self.url, timeout=5)
+        model = Model(SEED_PATH, catalog_cache=cache, snapshot_path=self.snapshot_path, result_cache_path=None)
+        if model.refresh_thread is not None:
+            model.refresh_thread.join(timeout=10)
+        return model
+
+    # function to age the cached copy so the next refresh can be seen restarting its TTL
+    def age_cache(self):
+        os.utime(self.cache_path, (0, 0))
+
+    def test_new_catalog_is_swapped_in(self):
+        model = self.start_model()
+        self.assertEqual(len(model.catalog), 5273)  # the seed until the update is applied
+
+        self.assertTrue(model.apply_catalog_updates())
+        self.assertEqual(model.catalog.names, ["Test-1 b", "Test-2 c"])
+        self.assertEqual([planet.name for planet in model.filteredPlanets], ["Test-1 b", "Test-2 c"])
+        self.assertFalse(model.is_refreshing())
+
+    def test_not_modified_restarts_the_ttl(self):
+        self.start_model().apply_catalog_updates()
+        self.age_cache()
+        with open(self.cache_path, "rb") as cache_file:
+            cached = cache_file.read()
+
+        model = self.start_model()
+        self.assertEqual(ArchiveHandler.requests, 2)
+        self.assertFalse(model.apply_catalog_updates())
+        self.assertGreater(os.path.getmtime(self.cache_path), 0)  # touched, no longer aged
+        with open(self.cache_path, "rb") as cache_file:
+            self.assertEqual(cache_file.read(), cached)
+
+        # the snapshot still matches the cached copy, so the next start up does not parse it again
+        model = self.start_model(ttl=60)
+        self.assertIsNone(model.catalog_cache.entry)
+        self.assertEqual(model.catalog.names, ["Test-1 b", "Test-2 c"])
+
+    def test_unchanged_data_is_not_swapped_in(self):
+        ArchiveHandler.send_etag = False
+        self.start_model().apply_catalog_updates()
+        self.age_cache()
+
+        model = self.start_model()
+        self.assertEqual(ArchiveHandler.requests, 2)
+        self.assertFalse(model.apply_catalog_updates())
+        self.assertGreater(os.path.getmtime(self.cache_path), 0)  # touched, no longer aged
+
+    def test_malformed_cache_falls_back_to_the_seed(self):
+        with open(self.cache_path, "w", encoding="utf-8") as cache_file:
+            json.dump({'hash': "0"}, cache_file)
+
+        model = self.start_model(ttl=60)
+        self.assertEqual(len(model.catalog), 5273)
+
+
+if __name__ == '__main__':
+    unittest.main()